@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+# Pod ASGI zapytania każdego żądania działają w osobnym wątku, więc
+# trwałe połączenia nie byłyby ponownie używane; połączenia z puli
+# wracają do niej po każdym żądaniu
+os.environ.setdefault('DATABASE_POOL', 'true')
 
 application = get_asgi_application()
@@ -14,6 +14,25 @@ from pathlib import Path
 
 import os
 
+
+def env_bool(name, default):
+    """Return a boolean environment variable."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default):
+    """Return an integer environment variable, None for an empty value."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    if not value.strip():
+        return None
+    return int(value)
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -39,6 +58,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    # Klasy operatorów w indeksach funkcyjnych (OpClass)
+    'django.contrib.postgres',
     'localflavor',
     'core',
     'rest_framework',
@@ -46,9 +67,12 @@ INSTALLED_APPS = [
     'user',
     'tournament',
     'ranking',
+    'job',
 ]
 
 MIDDLEWARE = [
+    # Pierwsze, aby mierzyć cały czas żądania
+    'core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -91,12 +115,75 @@ DATABASES = {
         'PASSWORD': os.environ.get('DATABASE_PASS'),
         'HOST': os.environ.get('DATABASE_HOST'),  # Możesz zmienić na adres Twojej bazy danych
         'PORT': '5432',
+        # Połączenie jest używane ponownie przez kolejne żądania
+        # (sekundy, 0 - zamykane po każdym żądaniu, pusta wartość - bez limitu)
+        'CONN_MAX_AGE': env_int('DATABASE_CONN_MAX_AGE', 60),
+        # Sprawdzenie połączenia przed ponownym użyciem w nowym żądaniu
+        'CONN_HEALTH_CHECKS': env_bool('DATABASE_CONN_HEALTH_CHECKS', True),
         "OPTIONS": {
             "server_side_binding": True,      # Port używany przez PostgreSQL
         }
     }
 }
 
+# Pula połączeń psycopg 3 (pakiet psycopg[pool])
+if env_bool('DATABASE_POOL', False):
+    # Pula sama utrzymuje połączenia, Django nie może ich trzymać
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': env_int('DATABASE_POOL_MIN_SIZE', 2),
+        'max_size': env_int('DATABASE_POOL_MAX_SIZE', 10),
+        'timeout': env_int('DATABASE_POOL_TIMEOUT', 10),
+        'max_idle': env_int('DATABASE_POOL_MAX_IDLE', 600),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The cache must be shared by the web processes and run_jobs, otherwise
+# invalidations (e.g. of the last ranking after a job writes a snapshot)
+# reach only the process that made them. The default is Redis, so cache
+# hits do not query the database. Without Redis, set
+# CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache to use the
+# table created by `manage.py createcachetable` (every hit is then a SQL
+# query). LocMemCache is only correct with a single process.
+
+CACHE_BACKEND = os.environ.get(
+    'CACHE_BACKEND', 'django.core.cache.backends.redis.RedisCache'
+)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION',
+            'django_cache' if CACHE_BACKEND.endswith('.DatabaseCache')
+            else 'redis://localhost:6379/0',
+        ),
+    }
+}
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # Czas i zapytania każdego żądania (core.middleware)
+        'core.middleware': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -157,4 +244,16 @@ REST_FRAMEWORK = {
     ]
 }
 
+SPECTACULAR_SETTINGS = {
+    # Widoki asynchroniczne nie są widokami DRF
+    'PREPROCESSING_HOOKS': ['core.schema.add_async_views'],
+}
+
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+# Sesje czytane z cache, zapisywane także w bazie danych
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Użytkownik sesji czytany ze współdzielonego cache, unieważniany przy
+# zapisie (core.signals). Sesje sprzed wprowadzenia CachedModelBackend
+# przenosi migracja core 0029, więc wdrożenie nikogo nie wylogowuje.
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
@@ -23,6 +23,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 
 
 urlpatterns = [
@@ -39,6 +40,7 @@ urlpatterns = [
     path('api/user/', include('user.urls')),
     path('api/', include('tournament.urls')),
     path('api/', include('ranking.urls')),
+    path('api/', include('job.urls')),
     path('tournaments/', include('tournament.html_urls')),
     path('user/', include('user.urls_html')),
     path('ranking/', include('ranking.urls_html')),
@@ -49,3 +51,5 @@ if settings.DEBUG:
         settings.MEDIA_URL,
         document_root=settings.MEDIA_ROOT,
     )
+    # Serwer ASGI nie serwuje plików statycznych jak runserver
+    urlpatterns += staticfiles_urlpatterns()
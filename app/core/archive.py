@@ -0,0 +1,445 @@
+"""
+Bulk import of the federation archive from CSV files.
+"""
+
+import csv
+import datetime
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from core.models import (
+    PlayerTournamentResult,
+    Team,
+    Tournament,
+    User,
+)
+from ranking import engine
+
+# Liczba wierszy w jednym poleceniu COPY lub INSERT
+BATCH_SIZE = 10000
+# Tabele, których indeksy można odbudować po imporcie; użytkownicy
+# i turnieje są pomijane, aby import nie blokował logowania i kalendarza
+DEFERRED_INDEX_MODELS = [
+    PlayerTournamentResult,
+    Tournament.teams.through,
+    Team.players.through,
+]
+
+PLAYER_COLUMNS = ["email", "imie", "nazwisko", "gender"]
+TOURNAMENT_COLUMNS = [
+    "ref",
+    "organizer",
+    "name",
+    "tour_type",
+    "city",
+    "money_prize",
+    "sex",
+    "date_of_beginning",
+    "date_of_finishing",
+]
+RESULT_COLUMNS = ["tournament", "player1", "player2", "position", "points"]
+
+
+def batches(items):
+    """Yield consecutive slices of a list, BATCH_SIZE items each."""
+    for start in range(0, len(items), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        yield items[start:end]
+
+
+def copy_create(model, objs):
+    """Insert model instances in batches and set their primary keys.
+
+    On PostgreSQL the primary keys are taken from the sequence up front
+    and the rows are sent with COPY; other databases use bulk_create.
+    """
+    if connection.vendor != "postgresql":
+        return model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+
+    opts = model._meta
+    fields = opts.concrete_fields
+    quote_name = connection.ops.quote_name
+    sql = "COPY %s (%s) FROM STDIN" % (
+        quote_name(opts.db_table),
+        ", ".join(quote_name(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        for batch in batches(objs):
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [opts.db_table, opts.pk.column, len(batch)],
+            )
+            for obj, (pk,) in zip(batch, cursor.fetchall()):
+                obj.pk = pk
+            with cursor.copy(sql) as copy:
+                for obj in batch:
+                    copy.write_row(
+                        [
+                            field.get_db_prep_save(
+                                field.pre_save(obj, True), connection
+                            )
+                            for field in fields
+                        ]
+                    )
+    for obj in objs:
+        obj._state.adding = False
+    return objs
+
+
+def secondary_indexes(cursor, table):
+    """Return the names and definitions of a table's non-unique indexes.
+
+    Besides the indexes of Meta.indexes these are the indexes Django
+    creates for foreign keys.
+    """
+    cursor.execute(
+        "SELECT idx.relname, pg_get_indexdef(pg_index.indexrelid) "
+        "FROM pg_index JOIN pg_class idx ON idx.oid = pg_index.indexrelid "
+        "WHERE pg_index.indrelid = %s::regclass "
+        "AND NOT pg_index.indisunique AND NOT pg_index.indisprimary",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+@contextmanager
+def deferred_indexes(models):
+    """Drop the secondary indexes of models and rebuild them on exit.
+
+    Building an index once is cheaper than updating it for every row.
+    Unique constraints are kept, so duplicates are still rejected. The
+    tables stay locked until the transaction commits. PostgreSQL only.
+    """
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        indexes = [
+            index
+            for model in models
+            for index in secondary_indexes(cursor, model._meta.db_table)
+        ]
+        for name, _ in indexes:
+            cursor.execute("DROP INDEX %s" % quote_name(name))
+    yield
+    with connection.cursor() as cursor:
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+
+def read_csv(path, columns):
+    """Yield the line numbers and rows of a CSV file with a header.
+
+    Cells are separated by commas or semicolons and stripped of spaces.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        try:
+            dialect = csv.Sniffer().sniff(file.readline(), delimiters=",;")
+        except csv.Error:
+            dialect = csv.excel
+        file.seek(0)
+        reader = csv.DictReader(file, dialect=dialect)
+        missing = [
+            column
+            for column in columns
+            if column not in (reader.fieldnames or [])
+        ]
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(missing)}.")
+        for row in reader:
+            yield reader.line_num, {
+                key: (value or "").strip()
+                for key, value in row.items()
+                if key is not None
+            }
+
+
+class ArchiveImport:
+    """Validate and load CSV files of players, tournaments and results.
+
+    Every row is validated and every reference resolved in memory before
+    anything is written, so a broken archive leaves the database intact.
+    """
+
+    def __init__(self):
+        self.errors = []
+        # Użytkownicy po adresie e-mail, istniejący i nowi
+        self.users = {}
+        self.new_users = []
+        self.tournaments = {}
+        self.results = []
+        # Liczba wierszy i czas zapisu każdej tabeli
+        self.stats = {}
+
+    def error(self, path, line, message):
+        self.errors.append(f"{path}:{line}: {message}")
+
+    def read_players(self, path):
+        """Read players and organizers, skipping existing e-mails."""
+        password = make_password(None)
+        for line, row in read_csv(path, PLAYER_COLUMNS):
+            email = BaseUserManager.normalize_email(row["email"])
+            user_type = row.get("user_type") or User.UserType.PLAYER
+            if not email:
+                self.error(path, line, "E-mail is required.")
+            elif email in self.users:
+                self.error(path, line, f"{email} is listed twice.")
+            elif user_type not in User.UserType.values:
+                self.error(path, line, f"Invalid user type {user_type}.")
+            elif (
+                user_type == User.UserType.PLAYER
+                and row["gender"] not in User.Gender.values
+            ):
+                self.error(path, line, f"Invalid gender {row['gender']}.")
+            else:
+                try:
+                    birth_date = self.parse_date(row.get("data_urodzenia"))
+                except ValueError:
+                    self.error(path, line, "Invalid birth date.")
+                    continue
+                self.users[email] = User(
+                    email=email,
+                    # Konta z archiwum logują się po zresetowaniu hasła
+                    password=password,
+                    imie=row["imie"],
+                    nazwisko=row["nazwisko"],
+                    user_type=user_type,
+                    gender=row["gender"],
+                    data_urodzenia=birth_date,
+                )
+
+    def read_tournaments(self, path):
+        """Read tournaments, keyed by their reference in the archive."""
+        for line, row in read_csv(path, TOURNAMENT_COLUMNS):
+            ranking_type = (
+                row.get("ranking_type") or Tournament.RankingType.NONRANKING
+            )
+            if row["ref"] in self.tournaments:
+                self.error(
+                    path, line, f"Tournament {row['ref']} is listed twice."
+                )
+                continue
+            if row["tour_type"] not in Tournament.TourType.values:
+                self.error(path, line, f"Invalid type {row['tour_type']}.")
+                continue
+            if row["sex"] not in Tournament.Sex.values:
+                self.error(path, line, f"Invalid sex {row['sex']}.")
+                continue
+            if ranking_type not in Tournament.RankingType.values:
+                self.error(path, line, f"Invalid ranking type {ranking_type}.")
+                continue
+            try:
+                money_prize = int(row["money_prize"])
+                beginning = self.parse_date(row["date_of_beginning"])
+                finishing = self.parse_date(row["date_of_finishing"])
+            except ValueError:
+                self.error(path, line, "Invalid prize or dates.")
+                continue
+            if not beginning or not finishing or finishing < beginning:
+                self.error(path, line, "Invalid dates.")
+                continue
+            tournament = Tournament(
+                name=row["name"],
+                tour_type=row["tour_type"],
+                city=row["city"],
+                money_prize=money_prize,
+                sex=row["sex"],
+                ranking_type=ranking_type,
+                date_of_beginning=beginning,
+                date_of_finishing=finishing,
+            )
+            self.tournaments[row["ref"]] = (
+                path,
+                line,
+                BaseUserManager.normalize_email(row["organizer"]),
+                tournament,
+            )
+
+    def read_results(self, path):
+        """Read the position and points of each team in a tournament."""
+        for line, row in read_csv(path, RESULT_COLUMNS):
+            try:
+                position = int(row["position"])
+                points = int(row["points"])
+            except ValueError:
+                self.error(path, line, "Invalid position or points.")
+                continue
+            if position < 1 or points < 0:
+                self.error(path, line, "Invalid position or points.")
+                continue
+            self.results.append(
+                (
+                    path,
+                    line,
+                    row["tournament"],
+                    [
+                        BaseUserManager.normalize_email(row["player1"]),
+                        BaseUserManager.normalize_email(row["player2"]),
+                    ],
+                    position,
+                    points,
+                )
+            )
+
+    def parse_date(self, value):
+        return datetime.date.fromisoformat(value) if value else None
+
+    def resolve(self):
+        """Resolve organizers and players of the results by e-mail."""
+        emails = {
+            organizer for _, _, organizer, _ in self.tournaments.values()
+        }
+        emails.update(
+            email
+            for _, _, _, players, _, _ in self.results
+            for email in players
+        )
+        emails.update(self.users)
+        for batch in batches(list(emails)):
+            for user in User.objects.filter(email__in=batch).only(
+                "id", "email", "imie", "nazwisko", "user_type", "gender"
+            ):
+                self.users[user.email] = user
+        self.new_users = [
+            user for user in self.users.values() if user._state.adding
+        ]
+
+        for path, line, organizer, tournament in self.tournaments.values():
+            user = self.users.get(organizer)
+            if user is None or user.user_type != User.UserType.ORGANIZER:
+                self.error(path, line, f"{organizer} is not an organizer.")
+
+        seen = {}
+        for path, line, ref, emails, _, _ in self.results:
+            if ref not in self.tournaments:
+                self.error(
+                    path, line, f"Tournament {ref} is not in the archive."
+                )
+                continue
+            tournament = self.tournaments[ref][3]
+            if emails[0] == emails[1]:
+                self.error(path, line, "A team must have 2 different players.")
+            for email in emails:
+                user = self.users.get(email)
+                if user is None or user.user_type != User.UserType.PLAYER:
+                    self.error(path, line, f"{email} is not a player.")
+                elif user.gender != tournament.sex:
+                    self.error(
+                        path,
+                        line,
+                        f"{email} does not match the gender of the tournament.",
+                    )
+                elif (ref, email) in seen:
+                    self.error(
+                        path,
+                        line,
+                        f"{email} already has a result in line "
+                        f"{seen[ref, email]}.",
+                    )
+                else:
+                    seen[ref, email] = line
+
+    def timed(self, model, objs):
+        """Write instances of a model and record the rows per second."""
+        start = time.perf_counter()
+        copy_create(model, objs)
+        rows, seconds = self.stats.get(model._meta.db_table, (0, 0.0))
+        self.stats[model._meta.db_table] = (
+            rows + len(objs),
+            seconds + time.perf_counter() - start,
+        )
+        return objs
+
+    @transaction.atomic
+    def write(self, defer_indexes=False):
+        """Write the archive in one transaction."""
+        if defer_indexes and connection.vendor == "postgresql":
+            with deferred_indexes(DEFERRED_INDEX_MODELS):
+                player_ids = self.write_rows()
+        else:
+            player_ids = self.write_rows()
+
+        # Punkty rankingowe zawodników z nowymi wynikami, czytanymi
+        # już przez odbudowane indeksy
+        for batch in batches(player_ids):
+            engine.refresh_scores(batch)
+
+    def write_rows(self):
+        """Write the rows, return the ids of the players with results."""
+        self.timed(User, self.new_users)
+
+        tournaments = {}
+        for ref, (_, _, organizer, tournament) in self.tournaments.items():
+            tournament.user = self.users[organizer]
+            tournaments[ref] = tournament
+        self.timed(Tournament, list(tournaments.values()))
+
+        teams = self.write_teams()
+        registrations = {}
+        results = []
+        for _, _, ref, emails, position, points in self.results:
+            tournament = tournaments[ref]
+            team = teams[self.pair_key(emails)]
+            registrations[tournament.id, team.id] = Tournament.teams.through(
+                tournament_id=tournament.id, team_id=team.id
+            )
+            results.extend(
+                PlayerTournamentResult(
+                    player_id=self.users[email].id,
+                    tournament=tournament,
+                    team=team,
+                    points_awarded=points,
+                    position=position,
+                    tournament_date=tournament.date_of_finishing,
+                )
+                for email in emails
+            )
+        self.timed(Tournament.teams.through, list(registrations.values()))
+        self.timed(PlayerTournamentResult, results)
+        return list({result.player_id for result in results})
+
+    def pair_key(self, emails):
+        return tuple(sorted(self.users[email].id for email in emails))
+
+    def write_teams(self):
+        """Return the teams of the result pairs, creating the missing ones."""
+        keys = {}
+        for _, _, _, emails, _, _ in self.results:
+            keys[self.pair_key(emails)] = emails
+        teams = {}
+        for batch in batches(list({low for low, _ in keys})):
+            for team in Team.objects.filter(player_low_id__in=batch).only(
+                "id", "player_low", "player_high"
+            ):
+                key = (team.player_low_id, team.player_high_id)
+                if key in keys:
+                    teams[key] = team
+
+        new_teams = []
+        for key, emails in keys.items():
+            if key not in teams:
+                team = Team()
+                team.set_display([self.users[email] for email in emails])
+                teams[key] = team
+                new_teams.append(team)
+        self.timed(Team, new_teams)
+        self.timed(
+            Team.players.through,
+            [
+                Team.players.through(team_id=team.id, user_id=player_id)
+                for team in new_teams
+                for player_id in team.player_ids
+            ],
+        )
+        return teams
+
+    def analyze(self):
+        """Refresh the planner statistics of the loaded tables."""
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            for table in self.stats:
+                cursor.execute("ANALYZE %s" % connection.ops.quote_name(table))
@@ -0,0 +1,50 @@
+"""
+Authentication backends.
+"""
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Górna granica nieaktualności, gdyby zmiana ominęła sygnały
+USER_TIMEOUT = 60 * 5
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def user_cache():
+    """Return the cache of session users, None if it is process-local.
+
+    core.signals drops a saved user only from the cache of the saving
+    process, so with a per-process cache the other processes would keep
+    authenticating a deactivated user or an old session hash.
+    """
+    cache = caches["default"]
+    if isinstance(cache, (LocMemCache, DummyCache)):
+        return None
+    return cache
+
+
+class CachedModelBackend(ModelBackend):
+    """Model backend reading the user of a session from the cache.
+
+    Entries are dropped by core.signals whenever a user is saved or
+    deleted, so an authenticated request needs no user query. The cache
+    is only used when it is shared by all processes.
+    """
+
+    def get_user(self, user_id):
+        cache = user_cache()
+        if cache is None:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, USER_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
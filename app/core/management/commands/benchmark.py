@@ -0,0 +1,350 @@
+"""
+Django command to benchmark the key API endpoints.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import (
+    Job,
+    PlayerTournamentResult,
+    Team,
+    Tournament,
+    User,
+)
+from job import queue
+from ranking import cache as ranking_cache
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of sorted values."""
+    return values[max(round(fraction * len(values)) - 1, 0)]
+
+
+def summarize(timings, queries):
+    """Return the query count and timing statistics of measurements."""
+    timings = sorted(timings)
+    return {
+        "queries": max(queries),
+        "min_queries": min(queries),
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "max_ms": round(timings[-1], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+def git_commit():
+    """Return the checked out commit, if the code is in a git repository."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Scenario:
+    """A request to an endpoint repeated by the benchmark."""
+
+    def __init__(
+        self, method, url, user=None, data=None, before=None, job=False
+    ):
+        self.method = method
+        self.url = url
+        self.data = data
+        # Przygotowanie iteracji, nie wliczane do czasu żądania
+        self.before = before
+        # Żądanie kolejkuje zadanie, którego wykonanie mierzymy osobno
+        self.job = job
+        self.client = Client()
+        if user is not None:
+            self.client.force_login(user)
+
+    def request(self):
+        if self.method == "get":
+            return self.client.get(self.url)
+        return self.client.post(
+            self.url, self.data, content_type="application/json"
+        )
+
+
+class Command(BaseCommand):
+    """Django command timing the key endpoints and their queries."""
+
+    help = "Benchmark the key API endpoints and write a JSON report."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Timed requests per endpoint, defaults to 20.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=2,
+            help="Untimed requests per endpoint, defaults to 2.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            help="Endpoint to benchmark, can be repeated. Defaults to all.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of the JSON report, printed when not given.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON report of an earlier run to compare with.",
+        )
+
+    def handle(self, *args, **options):
+        """Logic of the command"""
+        # Postęp na stderr, gdy raport JSON trafia na stdout
+        self.log = self.stdout if options["output"] else self.stderr
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        if options["warmup"] < 0:
+            raise CommandError("--warmup must not be negative.")
+
+        # Klient testowy wysyła żądania z nagłówkiem Host: testserver
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            scenarios = self.scenarios()
+            names = options["scenario"] or list(scenarios)
+            unknown = set(names) - set(scenarios)
+            if unknown:
+                raise CommandError(
+                    f"Unknown scenarios: {', '.join(sorted(unknown))}. "
+                    f"Available: {', '.join(scenarios)}."
+                )
+            results = {
+                name: self.run(name, scenarios[name], options)
+                for name in names
+            }
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "dataset": {
+                "players": User.objects.filter(
+                    user_type=User.UserType.PLAYER
+                ).count(),
+                "teams": Team.objects.count(),
+                "tournaments": Tournament.objects.count(),
+                "results": PlayerTournamentResult.objects.count(),
+            },
+            "iterations": options["iterations"],
+            "scenarios": results,
+        }
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                self.compare(results, json.load(file)["scenarios"])
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f"Report written to {options['output']}.")
+            )
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+    def scenarios(self):
+        """Return the benchmarked requests by name."""
+        organizer = (
+            User.objects.filter(
+                user_type=User.UserType.ORGANIZER,
+                created_tournaments__teams__isnull=False,
+            )
+            .order_by("id")
+            .first()
+        )
+        if organizer is None:
+            raise CommandError(
+                "No tournament with teams found, run seed_data first."
+            )
+        tournament = (
+            organizer.created_tournaments.filter(teams__isnull=False)
+            .order_by("-date_of_finishing", "id")
+            .first()
+        )
+        team_ids = list(tournament.teams.values_list("id", flat=True))
+        player, partner = self.unregistered_pair(tournament)
+
+        return {
+            "public-tournaments": Scenario(
+                "get", reverse("tournament:public-tournament-list")
+            ),
+            "last-ranking": Scenario(
+                "get",
+                reverse("ranking:ranking-get-last-ranking") + "?gender=MALE",
+            ),
+            "last-ranking-uncached": Scenario(
+                "get",
+                reverse("ranking:ranking-get-last-ranking") + "?gender=MALE",
+                before=lambda: ranking_cache.invalidate("MALE"),
+            ),
+            "ranking-create": Scenario(
+                "post", reverse("ranking:ranking-list"), user=organizer, job=True
+            ),
+            "award-points": Scenario(
+                "post",
+                reverse(
+                    "tournament:tournament-award-points", args=[tournament.id]
+                ),
+                user=organizer,
+                data={
+                    "team_results": [
+                        {"team_id": team_id, "position": position}
+                        for position, team_id in enumerate(team_ids, start=1)
+                    ]
+                },
+            ),
+            "create-team": Scenario(
+                "post",
+                reverse(
+                    "tournament:tournament-create-team", args=[tournament.id]
+                ),
+                user=player,
+                data={"players": [player.id, partner.id]},
+            ),
+        }
+
+    def unregistered_pair(self, tournament):
+        """Return two players who can register a team in a tournament.
+
+        A player may have only one partner in a tournament, so neither
+        of them is registered in it yet.
+        """
+        registered = {
+            player_id
+            for player_ids in tournament.teams.values_list(
+                "player_ids", flat=True
+            )
+            for player_id in player_ids
+        }
+        players = list(
+            User.objects.filter(
+                user_type=User.UserType.PLAYER, gender=tournament.sex
+            )
+            .exclude(id__in=registered)
+            .order_by("id")[:2]
+        )
+        if len(players) < 2:
+            raise CommandError(
+                f"No free pair of players for tournament {tournament.id}."
+            )
+        return players
+
+    def run(self, name, scenario, options):
+        """Time the requests of a scenario and count their queries."""
+        timings = []
+        queries = []
+        job_timings = []
+        job_queries = []
+        for iteration in range(options["warmup"] + options["iterations"]):
+            if scenario.before:
+                scenario.before()
+            # Zapisy są wycofywane, aby każda iteracja miała te same dane
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = scenario.request()
+                    elapsed = time.perf_counter() - start
+                if response.status_code >= 400:
+                    raise CommandError(
+                        f"{name} returned {response.status_code}: "
+                        f"{response.content[:200]!r}"
+                    )
+                if scenario.job:
+                    with CaptureQueriesContext(connection) as job_captured:
+                        start = time.perf_counter()
+                        self.run_job(name, response)
+                        job_elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+
+            if iteration >= options["warmup"]:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured))
+                if scenario.job:
+                    job_timings.append(job_elapsed * 1000)
+                    job_queries.append(len(job_captured))
+
+        result = {
+            "method": scenario.method.upper(),
+            "url": scenario.url,
+            "status": response.status_code,
+            **summarize(timings, queries),
+        }
+        line = (
+            f"{name}: median {result['median_ms']:.1f} ms, "
+            f"p95 {result['p95_ms']:.1f} ms, {result['queries']} queries"
+        )
+        if scenario.job:
+            result["job"] = summarize(job_timings, job_queries)
+            line += (
+                f"; job median {result['job']['median_ms']:.1f} ms, "
+                f"{result['job']['queries']} queries"
+            )
+        self.log.write(f"{line}.", self.style.HTTP_INFO)
+        return result
+
+    def run_job(self, name, response):
+        """Execute the job queued by a request, as a worker would."""
+        job = Job.objects.get(pk=response.json()["job_id"])
+        queue.run(job)
+        if job.status != Job.Status.SUCCEEDED:
+            raise CommandError(f"The job of {name} failed: {job.error}")
+
+    def compare(self, results, baseline):
+        """Print the change of every scenario against a baseline."""
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                self.log.write(f"{name}: not in the baseline.")
+                continue
+            self.compare_summary(name, result, before)
+            if "job" in result and "job" in before:
+                self.compare_summary(f"{name} job", result["job"], before["job"])
+
+    def compare_summary(self, name, result, before):
+        """Print the change of the median time and the query count."""
+        change = (
+            result["median_ms"] / before["median_ms"] - 1
+            if before["median_ms"]
+            else 0.0
+        )
+        line = (
+            f"{name}: median {before['median_ms']:.1f} -> "
+            f"{result['median_ms']:.1f} ms ({change:+.0%}), "
+            f"queries {before['queries']} -> {result['queries']}."
+        )
+        if result["queries"] > before["queries"]:
+            line = self.style.WARNING(line)
+        self.log.write(line)
@@ -0,0 +1,153 @@
+"""
+Django command to compute ranking snapshots.
+"""
+
+import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from core.models import User
+from ranking import backfill, engine
+
+
+def _init_worker():
+    """Prepare Django in a worker process."""
+    django.setup()
+
+
+def _compute(gender, as_of):
+    """Compute the leaderboard of one category and time it."""
+    start = time.perf_counter()
+    rows = engine.compute_ranking(gender, as_of)
+    return rows, time.perf_counter() - start
+
+
+def _backfill(gender, dates):
+    """Sweep and store the snapshots of one category, timing both phases."""
+    sweep_time = 0.0
+
+    def timed_snapshots():
+        nonlocal sweep_time
+        snapshots = backfill.sweep_rankings(gender, dates)
+        while True:
+            start = time.perf_counter()
+            snapshot = next(snapshots, None)
+            sweep_time += time.perf_counter() - start
+            if snapshot is None:
+                return
+            yield snapshot
+
+    start = time.perf_counter()
+    written = backfill.write_snapshots(gender, dates, timed_snapshots())
+    total_time = time.perf_counter() - start
+    return written, sweep_time, total_time - sweep_time
+
+
+class Command(BaseCommand):
+    """Django command computing ranking snapshots for a date."""
+
+    help = "Compute and store ranking snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--as-of",
+            type=datetime.date.fromisoformat,
+            help="Date of the snapshots (YYYY-MM-DD), defaults to today.",
+        )
+        parser.add_argument(
+            "--gender",
+            action="append",
+            choices=User.Gender.values,
+            help="Category to compute, can be repeated. Defaults to all.",
+        )
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            type=datetime.date.fromisoformat,
+            help="Backfill snapshots from this date up to --as-of.",
+        )
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=7,
+            help="Days between backfilled snapshots, defaults to 7.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of worker processes, defaults to one per category.",
+        )
+
+    def handle(self, *args, **options):
+        """Logic of the command"""
+        as_of = options["as_of"] or timezone.now().date()
+        genders = options["gender"] or User.Gender.values
+        workers = options["workers"] or len(genders)
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        if options["date_from"]:
+            if options["every"] < 1:
+                raise CommandError("--every must be at least 1.")
+            dates = backfill.snapshot_dates(
+                options["date_from"], as_of, options["every"]
+            )
+            if not dates:
+                raise CommandError("--from must not be after --as-of.")
+            self.stdout.write(
+                f"Backfilling {len(dates)} rankings "
+                f"from {dates[0]} to {dates[-1]}.."
+            )
+            task, args = _backfill, (dates,)
+        else:
+            self.stdout.write(f"Computing rankings as of {as_of}..")
+            task, args = _compute, (as_of,)
+
+        start = time.perf_counter()
+        if workers == 1:
+            results = {gender: task(gender, *args) for gender in genders}
+        else:
+            # Procesy potomne otwierają własne połączenia z bazą danych
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker
+            ) as executor:
+                futures = {
+                    gender: executor.submit(task, gender, *args)
+                    for gender in genders
+                }
+                results = {
+                    gender: future.result()
+                    for gender, future in futures.items()
+                }
+        compute_time = time.perf_counter() - start
+
+        for gender, result in results.items():
+            if task is _backfill:
+                written, sweep_time, write_time = result
+                self.stdout.write(
+                    f"{gender}: {written} snapshots, "
+                    f"swept in {sweep_time:.3f} s, "
+                    f"written in {write_time:.3f} s."
+                )
+                continue
+            rows, gender_time = result
+            write_start = time.perf_counter()
+            engine.write_snapshot(gender, as_of, rows)
+            self.stdout.write(
+                f"{gender}: {len(rows)} players, "
+                f"computed in {gender_time:.3f} s, "
+                f"written in {time.perf_counter() - write_start:.3f} s."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rankings computed in {compute_time:.3f} s, "
+                f"total {time.perf_counter() - start:.3f} s."
+            )
+        )
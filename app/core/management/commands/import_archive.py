@@ -0,0 +1,93 @@
+"""
+Django command to import the federation archive from CSV files.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.archive import ArchiveImport
+
+# Liczba błędów wypisywanych przed przerwaniem importu
+MAX_ERRORS = 20
+
+
+class Command(BaseCommand):
+    """Django command loading players, tournaments and results in bulk."""
+
+    help = "Import players, tournaments and results from CSV files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--players",
+            help="CSV with email, imie, nazwisko, gender and optionally "
+            "user_type (PL or OR) and data_urodzenia.",
+        )
+        parser.add_argument(
+            "--tournaments",
+            help="CSV with ref, organizer (e-mail), name, tour_type, city, "
+            "money_prize, sex, date_of_beginning, date_of_finishing and "
+            "optionally ranking_type.",
+        )
+        parser.add_argument(
+            "--results",
+            help="CSV with tournament (ref), player1, player2 (e-mails), "
+            "position and points.",
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Rebuild secondary indexes after loading (PostgreSQL). "
+            "The tables are locked until the import commits.",
+        )
+
+    def handle(self, *args, **options):
+        """Logic of the command"""
+        if not any(
+            options[name] for name in ("players", "tournaments", "results")
+        ):
+            raise CommandError(
+                "Give at least one of --players, --tournaments, --results."
+            )
+
+        archive = ArchiveImport()
+        start = time.perf_counter()
+        try:
+            if options["players"]:
+                archive.read_players(options["players"])
+            if options["tournaments"]:
+                archive.read_tournaments(options["tournaments"])
+            if options["results"]:
+                archive.read_results(options["results"])
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+        archive.resolve()
+        if archive.errors:
+            for message in archive.errors[:MAX_ERRORS]:
+                self.stderr.write(message)
+            raise CommandError(
+                f"Nothing imported, {len(archive.errors)} rows are invalid."
+            )
+        self.stdout.write(
+            f"Validated {len(archive.new_users)} new users, "
+            f"{len(archive.tournaments)} tournaments and "
+            f"{len(archive.results)} results "
+            f"in {time.perf_counter() - start:.3f} s."
+        )
+
+        write_start = time.perf_counter()
+        archive.write(defer_indexes=options["defer_indexes"])
+        archive.analyze()
+        for table, (rows, seconds) in archive.stats.items():
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(
+                f"{table}: {rows} rows in {seconds:.3f} s "
+                f"({rate:.0f} rows/s)."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archive imported in "
+                f"{time.perf_counter() - write_start:.3f} s, "
+                f"total {time.perf_counter() - start:.3f} s."
+            )
+        )
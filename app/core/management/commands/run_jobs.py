@@ -0,0 +1,48 @@
+"""
+Django command to process queued background jobs.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from job import queue
+
+
+class Command(BaseCommand):
+    """Django command running the background job worker."""
+
+    help = "Process background jobs from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the queued jobs and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        """Logic of the command"""
+        self.stdout.write("Waiting for jobs..")
+        while True:
+            # Długo działający proces musi sam zamykać zerwane połączenia
+            close_old_connections()
+            job = queue.run_next()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+            style = (
+                self.style.SUCCESS
+                if job.status == job.Status.SUCCEEDED
+                else self.style.ERROR
+            )
+            self.stdout.write(style(f"Job {job} finished."))
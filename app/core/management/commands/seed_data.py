@@ -0,0 +1,318 @@
+"""
+Django command to generate a synthetic federation for benchmarks.
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.backends import user_cache_key
+from core.models import (
+    Job,
+    PlayerRankingScore,
+    PlayerTournamentResult,
+    RankingEntry,
+    Team,
+    Tournament,
+    User,
+)
+from ranking import engine
+
+# Adresy e-mail wygenerowanych użytkowników, po nich usuwamy dane
+SEED_EMAIL_PREFIX = "seed-"
+# Liczba wierszy zapisywanych jednym zapytaniem
+BATCH_SIZE = 5000
+# Punktacja jak w award-points
+POINTS = {1: 100, 2: 60, 3: 30}
+CITIES = [
+    "Sopot",
+    "Gdańsk",
+    "Gdynia",
+    "Warszawa",
+    "Kraków",
+    "Wrocław",
+    "Poznań",
+    "Łódź",
+    "Szczecin",
+    "Kołobrzeg",
+]
+
+
+def seed_users():
+    """Return the users created by the seed command."""
+    return User.objects.filter(email__startswith=SEED_EMAIL_PREFIX)
+
+
+def clear_seed_data():
+    """Delete the users created by the seed command and their data.
+
+    Deleting only the users would keep their teams, whose players are
+    set to NULL, and send a signal for every deleted result and user.
+    The rows are deleted table by table in the order of their foreign
+    keys instead, so each table takes a constant number of queries.
+    """
+    users = seed_users()
+    user_ids = list(users.values_list("id", flat=True))
+    teams = Team.objects.filter(player_low__in=users)
+    tournaments = Tournament.objects.filter(user__in=users)
+
+    with transaction.atomic():
+        results = PlayerTournamentResult.objects.filter(
+            Q(player__in=users)
+            | Q(team__in=teams)
+            | Q(tournament__in=tournaments)
+        )
+        # Zamiast sygnału invalidate_player_score dla każdego wyniku
+        PlayerRankingScore.objects.filter(
+            player__in=results.values("player_id")
+        ).delete()
+        results._raw_delete(results.db)
+        Tournament.teams.through.objects.filter(
+            Q(team__in=teams) | Q(tournament__in=tournaments)
+        ).delete()
+        Team.players.through.objects.filter(team__in=teams).delete()
+        teams.delete()
+        tournaments.delete()
+
+        PlayerRankingScore.objects.filter(player__in=users).delete()
+        RankingEntry.objects.filter(player__in=users).delete()
+        Job.objects.filter(created_by__in=users).update(created_by=None)
+        LogEntry.objects.filter(user__in=users).delete()
+        User.groups.through.objects.filter(user__in=users).delete()
+        User.user_permissions.through.objects.filter(user__in=users).delete()
+        # Zamiast sygnału invalidate_cached_user dla każdego użytkownika
+        users._raw_delete(users.db)
+        keys = [user_cache_key(user_id) for user_id in user_ids]
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class Command(BaseCommand):
+    """Django command generating players, tournaments and results."""
+
+    help = "Generate a synthetic federation for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--players",
+            type=int,
+            default=2000,
+            help="Number of players, half of each gender. Defaults to 2000.",
+        )
+        parser.add_argument(
+            "--organizers",
+            type=int,
+            default=20,
+            help="Number of organizers, defaults to 20.",
+        )
+        parser.add_argument(
+            "--tournaments",
+            type=int,
+            default=300,
+            help="Number of tournaments, defaults to 300.",
+        )
+        parser.add_argument(
+            "--teams",
+            type=int,
+            default=16,
+            help="Teams registered in each tournament, defaults to 16.",
+        )
+        parser.add_argument(
+            "--seasons",
+            type=int,
+            default=3,
+            help="Years of finished tournaments, defaults to 3.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the random generator, defaults to 0.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete previously generated data first.",
+        )
+
+    def handle(self, *args, **options):
+        """Logic of the command"""
+        for name in ("players", "organizers", "tournaments", "seasons"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1.")
+        if options["players"] < 4 or options["teams"] < 2:
+            raise CommandError(
+                "At least 4 players and 2 teams per tournament are needed."
+            )
+
+        if options["clear"]:
+            start = time.perf_counter()
+            clear_seed_data()
+            self.stdout.write(
+                f"Previous data deleted in {time.perf_counter() - start:.3f} s."
+            )
+        elif seed_users().exists():
+            raise CommandError(
+                "Generated data already exists, use --clear to replace it."
+            )
+
+        self.random = random.Random(options["seed"])
+        self.today = timezone.now().date()
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            counts = self.generate(options)
+        self.stdout.write(
+            f"Generated {counts['players']} players, "
+            f"{counts['teams']} teams, "
+            f"{counts['tournaments']} tournaments and "
+            f"{counts['results']} results "
+            f"in {time.perf_counter() - start:.3f} s."
+        )
+
+        start = time.perf_counter()
+        engine.create_snapshots()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rankings computed in {time.perf_counter() - start:.3f} s."
+            )
+        )
+
+    def generate(self, options):
+        """Write the federation and return the numbers of created rows."""
+        # Jeden hash zamiast kosztownego hashowania dla każdego konta
+        password = make_password(None)
+        organizers = User.objects.bulk_create(
+            [
+                User(
+                    email=f"{SEED_EMAIL_PREFIX}organizer{i}@example.com",
+                    password=password,
+                    imie="Organizator",
+                    nazwisko=str(i),
+                    user_type=User.UserType.ORGANIZER,
+                )
+                for i in range(options["organizers"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        players = User.objects.bulk_create(
+            [
+                User(
+                    email=f"{SEED_EMAIL_PREFIX}player{i}@example.com",
+                    password=password,
+                    imie="Zawodnik" if i % 2 else "Zawodniczka",
+                    nazwisko=str(i),
+                    user_type=User.UserType.PLAYER,
+                    gender="MALE" if i % 2 else "FEMALE",
+                )
+                for i in range(options["players"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        teams = self.generate_teams(players)
+        tournaments = self.generate_tournaments(organizers, options)
+
+        # Drużyny losowane spośród par płci turnieju
+        registrations = []
+        results = []
+        for tournament in tournaments:
+            entries = self.random.sample(
+                teams[tournament.sex],
+                min(options["teams"], len(teams[tournament.sex])),
+            )
+            registrations.extend(
+                Tournament.teams.through(tournament=tournament, team=team)
+                for team in entries
+            )
+            if tournament.date_of_finishing > self.today:
+                continue
+            results.extend(
+                PlayerTournamentResult(
+                    player_id=player_id,
+                    tournament=tournament,
+                    team=team,
+                    points_awarded=POINTS.get(position, 0),
+                    position=position,
+                    tournament_date=tournament.date_of_finishing,
+                )
+                for position, team in enumerate(entries, start=1)
+                for player_id in team.player_ids
+            )
+        Tournament.teams.through.objects.bulk_create(
+            registrations, batch_size=BATCH_SIZE
+        )
+        PlayerTournamentResult.objects.bulk_create(
+            results, batch_size=BATCH_SIZE
+        )
+        engine.refresh_scores(player.id for player in players)
+
+        return {
+            "players": len(players),
+            "teams": sum(len(pairs) for pairs in teams.values()),
+            "tournaments": len(tournaments),
+            "results": len(results),
+        }
+
+    def generate_teams(self, players):
+        """Pair the players of each gender into teams, return them by sex."""
+        teams = {}
+        for gender in User.Gender.values:
+            members = [player for player in players if player.gender == gender]
+            self.random.shuffle(members)
+            pairs = []
+            for low, high in zip(members[::2], members[1::2]):
+                team = Team()
+                team.set_display([low, high])
+                pairs.append(team)
+            teams[gender] = Team.objects.bulk_create(
+                pairs, batch_size=BATCH_SIZE
+            )
+        Team.players.through.objects.bulk_create(
+            [
+                Team.players.through(team=team, user_id=player_id)
+                for pairs in teams.values()
+                for team in pairs
+                for player_id in team.player_ids
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        return teams
+
+    def generate_tournaments(self, organizers, options):
+        """Spread tournaments over the seasons, a tenth of them upcoming."""
+        days = 365 * options["seasons"]
+        tournaments = []
+        for i in range(options["tournaments"]):
+            if i % 10 == 9:
+                offset = self.random.randint(1, 90)
+            else:
+                offset = -self.random.randint(1, days)
+            beginning = self.today + timedelta(days=offset)
+            tournaments.append(
+                Tournament(
+                    user=self.random.choice(organizers),
+                    name=f"Turniej {i}",
+                    tour_type=self.random.choice(Tournament.TourType.values),
+                    city=self.random.choice(CITIES),
+                    money_prize=self.random.randrange(0, 20001, 500),
+                    sex=self.random.choice(Tournament.Sex.values),
+                    ranking_type=self.random.choice(
+                        Tournament.RankingType.values
+                    ),
+                    date_of_beginning=beginning,
+                    date_of_finishing=beginning
+                    + timedelta(days=self.random.randint(0, 2)),
+                )
+            )
+        return Tournament.objects.bulk_create(
+            tournaments, batch_size=BATCH_SIZE
+        )
@@ -0,0 +1,176 @@
+"""
+Middleware measuring the cost of requests.
+"""
+
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Pomiary bieżącego żądania, uzupełniane przez serializery
+# (core.serializers.TimedSerializerMixin)
+current_timing = ContextVar("current_timing", default=None)
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestTiming:
+    """Measurements of a request made outside the middleware."""
+
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.serialize = 0.0
+        self.render = {}
+        self._serializing = False
+
+    @contextmanager
+    def serializing(self):
+        """Count the time of the block as serialization.
+
+        Queries made by the block are left to the db metric, and nested
+        serializers are counted once, by the outermost one.
+        """
+        if self._serializing:
+            yield
+            return
+        self._serializing = True
+        start = time.perf_counter()
+        queries = self.queries.duration
+        try:
+            yield
+        finally:
+            self._serializing = False
+            self.serialize += (time.perf_counter() - start) - (
+                self.queries.duration - queries
+            )
+
+
+class RequestTimingMiddleware:
+    """Report the time and queries of a request.
+
+    The measurements are sent in the Server-Timing header and logged
+    under the URL name of the view, e.g. tournament:tournament-list:
+
+    - db: time of the SQL queries, the description holds their number,
+    - serialize: time of the serializers turning objects into data,
+      without their queries,
+    - render: time of rendering a template or DRF response,
+    - app: remaining time of the request, mostly the view,
+    - total: wall time of the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        timing = request._timing = RequestTiming()
+        token = current_timing.set(timing)
+
+        try:
+            with self.track_queries(timing.queries):
+                response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+
+        self.report(request, response, start, timing)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        timing = request._timing = RequestTiming()
+        token = current_timing.set(timing)
+
+        # Zapytania asynchronicznego ORM wykonuje wątek synchroniczny
+        # żądania, więc tam podpinamy licznik do połączeń
+        stack = await sync_to_async(self.track_queries)(timing.queries)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            current_timing.reset(token)
+
+        self.report(request, response, start, timing)
+        return response
+
+    def track_queries(self, queries):
+        """Attach a query timer to the connections of the current thread."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(queries))
+        return stack
+
+    def report(self, request, response, start, timing):
+        """Set the Server-Timing header and log the request."""
+        total = time.perf_counter() - start
+        queries = timing.queries
+        render = 0.0
+        if "end" in timing.render:
+            render = timing.render["end"] - timing.render["start"]
+        app = max(total - queries.duration - timing.serialize - render, 0.0)
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f"db;dur={queries.duration * 1000:.1f};"
+                f'desc="{queries.count} queries"',
+                f"app;dur={app * 1000:.1f}",
+                f"serialize;dur={timing.serialize * 1000:.1f}",
+                f"render;dur={render * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+        match = request.resolver_match
+        logger.info(
+            "view=%s method=%s status=%s total_ms=%.1f db_ms=%.1f "
+            "db_queries=%d app_ms=%.1f serialize_ms=%.1f render_ms=%.1f",
+            match.view_name if match else "-",
+            request.method,
+            response.status_code,
+            total * 1000,
+            queries.duration * 1000,
+            queries.count,
+            app * 1000,
+            timing.serialize * 1000,
+            render * 1000,
+        )
+
+    def process_template_response(self, request, response):
+        render_timing = request._timing.render
+        render_timing["start"] = time.perf_counter()
+
+        def render_end(response):
+            render_timing["end"] = time.perf_counter()
+
+        response.add_post_render_callback(render_end)
+        return response
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_ranking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerRankingScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_score', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def rankings_to_entries(apps, schema_editor):
+    """Convert the JSON leaderboards into RankingEntry rows."""
+    Ranking = apps.get_model('core', 'Ranking')
+    RankingEntry = apps.get_model('core', 'RankingEntry')
+    User = apps.get_model('core', 'User')
+
+    for ranking in Ranking.objects.all():
+        # Starsze rankingi męskie zapisywały tylko imię i nazwisko
+        players_by_name = {}
+        known_ids = set()
+        for player in User.objects.filter(
+            gender=ranking.gender, user_type='PL'
+        ).order_by('id'):
+            players_by_name.setdefault(
+                f'{player.imie} {player.nazwisko}', player.id
+            )
+            known_ids.add(player.id)
+
+        entries = []
+        seen = set()
+        for position, row in sorted(
+            ranking.rankings.items(), key=lambda item: int(item[0])
+        ):
+            player_id = row.get('user_id') or players_by_name.get(
+                row.get('full_name')
+            )
+            if player_id not in known_ids or player_id in seen:
+                continue
+            seen.add(player_id)
+            entries.append(
+                RankingEntry(
+                    snapshot=ranking,
+                    position=int(position),
+                    player_id=player_id,
+                    points=row.get('points', 0),
+                )
+            )
+        RankingEntry.objects.bulk_create(entries)
+
+
+def entries_to_rankings(apps, schema_editor):
+    """Rebuild the JSON leaderboards from RankingEntry rows."""
+    Ranking = apps.get_model('core', 'Ranking')
+
+    for ranking in Ranking.objects.all():
+        ranking.rankings = {
+            entry.position: {
+                'user_id': entry.player_id,
+                'full_name': f'{entry.player.imie} {entry.player.nazwisko}',
+                'points': entry.points,
+            }
+            for entry in ranking.entries.select_related('player')
+        }
+        ranking.save(update_fields=['rankings'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_playerrankingscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('points', models.PositiveIntegerField()),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_entries', to=settings.AUTH_USER_MODEL)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='core.ranking')),
+            ],
+            options={
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['player', 'snapshot'], name='ranking_entry_player_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='rankingentry',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'position'), name='unique_ranking_entry_position'),
+        ),
+        migrations.AddConstraint(
+            model_name='rankingentry',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'player'), name='unique_ranking_entry_player'),
+        ),
+        migrations.AlterField(
+            model_name='ranking',
+            name='rankings',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(rankings_to_entries, entries_to_rankings),
+        migrations.RemoveField(
+            model_name='ranking',
+            name='rankings',
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:31
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_rankingentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ranking',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_job'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rankingentry',
+            name='ranking_entry_player_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rankingentry',
+            index=models.Index(fields=['player', 'snapshot'], include=('position', 'points'), name='ranking_entry_history_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_ranking_entry_history_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['date_of_beginning', 'id'], name='tournament_calendar_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['sex', 'date_of_beginning', 'id'], name='tournament_sex_calendar_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['date_of_finishing'], name='tournament_finishing_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:54
+
+from django.db import migrations, models
+
+
+def backfill_team_display(apps, schema_editor):
+    """Store the player ids and display names of existing teams."""
+    Team = apps.get_model('core', 'Team')
+
+    teams = list(Team.objects.prefetch_related('players'))
+    for team in teams:
+        players = sorted(team.players.all(), key=lambda player: player.id)
+        team.player_ids = [player.id for player in players]
+        if len(players) == 2:
+            team.display_name = ' & '.join(
+                f'{player.imie} {player.nazwisko}' for player in players
+            )
+    Team.objects.bulk_update(
+        teams, ['player_ids', 'display_name'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_tournament_calendar_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='display_name',
+            field=models.CharField(blank=True, max_length=130),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='player_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(
+            backfill_team_display, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:59
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_results(apps, schema_editor):
+    """Keep only the latest result of a player in a tournament."""
+    PlayerTournamentResult = apps.get_model('core', 'PlayerTournamentResult')
+    PlayerRankingScore = apps.get_model('core', 'PlayerRankingScore')
+
+    duplicates = (
+        PlayerTournamentResult.objects.values('player', 'tournament')
+        .annotate(count=Count('id'), latest=Max('id'))
+        .filter(count__gt=1)
+    )
+    players = set()
+    for row in duplicates:
+        PlayerTournamentResult.objects.filter(
+            player=row['player'], tournament=row['tournament']
+        ).exclude(id=row['latest']).delete()
+        players.add(row['player'])
+
+    # Punkty tych zawodników zostaną przeliczone przy odczycie rankingu
+    PlayerRankingScore.objects.filter(player__in=players).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_team_display'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_results, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='playertournamentresult',
+            constraint=models.UniqueConstraint(fields=('player', 'tournament'), name='unique_player_tournament_result'),
+        ),
+    ]
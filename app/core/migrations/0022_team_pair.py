@@ -0,0 +1,80 @@
+# Generated by Django 5.0.14 on 2026-10-17 18:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def merge_duplicate_teams(apps, schema_editor):
+    """Set the pair key of teams and merge teams of the same pair.
+
+    The oldest team of a pair is kept; tournaments and results of the
+    other teams are moved to it.
+    """
+    Team = apps.get_model('core', 'Team')
+    Tournament = apps.get_model('core', 'Tournament')
+    PlayerTournamentResult = apps.get_model('core', 'PlayerTournamentResult')
+    TournamentTeam = Tournament.teams.through
+
+    canonical = {}
+    merged = {}
+    for team in Team.objects.order_by('id'):
+        if len(team.player_ids) != 2:
+            continue
+        pair = tuple(sorted(team.player_ids))
+        if pair in canonical:
+            merged[team.id] = canonical[pair].id
+        else:
+            team.player_low_id, team.player_high_id = pair
+            canonical[pair] = team
+    Team.objects.bulk_update(
+        canonical.values(), ['player_low', 'player_high'], batch_size=1000
+    )
+    if not merged:
+        return
+
+    linked = set(
+        TournamentTeam.objects.filter(
+            team_id__in=set(merged.values())
+        ).values_list('tournament_id', 'team_id')
+    )
+    for link in TournamentTeam.objects.filter(
+        team_id__in=merged
+    ).order_by('id'):
+        target = merged[link.team_id]
+        # Turniej z obiema drużynami pary zachowuje jedno zgłoszenie
+        if (link.tournament_id, target) in linked:
+            link.delete()
+        else:
+            linked.add((link.tournament_id, target))
+            link.team_id = target
+            link.save()
+
+    for old_id, new_id in merged.items():
+        PlayerTournamentResult.objects.filter(team_id=old_id).update(
+            team_id=new_id
+        )
+    Team.objects.filter(id__in=merged).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_unique_player_tournament_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='player_high',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='player_low',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(
+            merge_duplicate_teams, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Ograniczenie w osobnej transakcji niż scalanie drużyn w 0022
+    dependencies = [
+        ('core', '0022_team_pair'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='team',
+            constraint=models.UniqueConstraint(fields=('player_low', 'player_high'), name='unique_team_pair'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 18:16
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def remove_duplicate_rankings(apps, schema_editor):
+    """Keep only the most recently written ranking of a gender and date."""
+    Ranking = apps.get_model('core', 'Ranking')
+
+    duplicates = (
+        Ranking.objects.values('gender', 'date')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        rankings = Ranking.objects.filter(
+            gender=row['gender'], date=row['date']
+        )
+        latest = rankings.order_by('-updated_at', '-id').first()
+        rankings.exclude(id=latest.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    # Indeksy i ograniczenie dodaje 0025, w osobnej transakcji
+    dependencies = [
+        ('core', '0023_unique_team_pair'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_rankings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-17 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0024_remove_duplicate_rankings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playertournamentresult',
+            index=models.Index(fields=['player', '-tournament_date'], include=('points_awarded',), name='result_player_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playertournamentresult',
+            index=models.Index(fields=['tournament_date'], include=('player', 'points_awarded'), name='result_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['user', '-id'], name='tournament_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['user_type', 'gender'], include=('imie', 'nazwisko'), name='user_type_gender_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='ranking',
+            constraint=models.UniqueConstraint(fields=('gender', 'date'), name='unique_ranking_gender_date'),
+        ),
+    ]
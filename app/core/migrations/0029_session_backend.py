@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-17 21:05
+
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.db import migrations
+
+OLD_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+NEW_BACKEND = 'core.backends.CachedModelBackend'
+
+
+def rewrite_session_backends(apps, schema_editor):
+    """Move sessions logged in with ModelBackend to CachedModelBackend.
+
+    Only the backends listed in AUTHENTICATION_BACKENDS can restore the
+    user of a session, so without this the sessions created before
+    CachedModelBackend would be logged out.
+    """
+    Session = apps.get_model('sessions', 'Session')
+    engine = import_module(settings.SESSION_ENGINE)
+    sessions = Session.objects.values_list('session_key', 'session_data')
+    for session_key, session_data in sessions.iterator():
+        store = engine.SessionStore(session_key)
+        if store.decode(session_data).get(BACKEND_SESSION_KEY) != OLD_BACKEND:
+            continue
+        # Zapis przez SessionStore odświeża też sesję w cache
+        store[BACKEND_SESSION_KEY] = NEW_BACKEND
+        store.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_team_pair_set_null'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            rewrite_session_backends, migrations.RunPython.noop
+        ),
+    ]
@@ -3,7 +3,9 @@ Database models.
 """
 
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.contrib.auth.models import (
     BaseUserManager,
     AbstractBaseUser,
@@ -84,6 +86,30 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = "email"
 
+    class Meta:
+        indexes = [
+            # Lista zawodników kategorii czytana wyłącznie z indeksu
+            models.Index(
+                fields=["user_type", "gender"],
+                include=["imie", "nazwisko"],
+                name="user_type_gender_idx",
+            ),
+            # Wyszukiwanie zawodników po fragmencie imienia, nazwiska lub
+            # e-maila; icontains porównuje UPPER(kolumna) przez LIKE
+            GinIndex(
+                OpClass(Upper("imie"), name="gin_trgm_ops"),
+                name="user_imie_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("nazwisko"), name="gin_trgm_ops"),
+                name="user_nazwisko_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="user_email_trgm_idx",
+            ),
+        ]
+
     def is_organizer(self):
         return self.user_type == self.UserType.ORGANIZER
 
@@ -105,26 +131,81 @@ class User(AbstractBaseUser, PermissionsMixin):
         return "Unknown User Type"
 
 
+class TeamManager(models.Manager):
+    """Manager for teams."""
+
+    def get_or_create_pair(self, first_id, second_id):
+        """Return the team of two players, creating it the first time."""
+        low, high = sorted((first_id, second_id))
+        # Drużyna i jej zawodnicy są zapisywani razem albo wcale
+        with transaction.atomic():
+            team, created = self.get_or_create(
+                player_low_id=low, player_high_id=high
+            )
+            if created:
+                team.players.set([low, high])
+        return team
+
+
 class Team(models.Model):
+    # Napis wyświetlany dla drużyny bez kompletu zawodników
+    INCOMPLETE_NAME = "Team with insufficient players"
+
     players = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="teams"
     )
+    # Kopia danych zawodników aktualizowana przez sygnały z core.signals
+    player_ids = models.JSONField(default=list, blank=True)
+    display_name = models.CharField(max_length=130, blank=True)
+    # Klucz pary: zawodnik o mniejszym i o większym ID
+    player_low = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    player_high = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    objects = TeamManager()
+
+    class Meta:
+        constraints = [
+            # Każda para zawodników ma jedną drużynę
+            models.UniqueConstraint(
+                fields=["player_low", "player_high"],
+                name="unique_team_pair",
+            ),
+        ]
 
     def clean(self):
         super().clean()
         if self.players.count() != 2:
             raise ValidationError("A team must have exactly 2 players.")
 
-    def __str__(self):
-        # Pobieramy listę zawodników przypisanych do drużyny, posortowaną po ID
-        player_list = self.players.all().order_by("id")
+    def set_display(self, players):
+        """Set the pair key, player ids and display name of the team."""
+        # Zawodnicy posortowani po ID
+        player_list = sorted(players, key=lambda player: player.id)
+        self.player_ids = [player.id for player in player_list]
         # Sprawdzamy, czy drużyna ma dokładnie dwóch zawodników
-        if player_list.count() == 2:
-            # Zakładamy, że zawodnicy mają atrybuty imie i nazwisko
-            player1 = player_list[0]
-            player2 = player_list[1]
-            return f"{player1.imie} {player1.nazwisko} & {player2.imie} {player2.nazwisko}"
-        return "Team with insufficient players"
+        if len(player_list) == 2:
+            self.player_low_id, self.player_high_id = self.player_ids
+            self.display_name = " & ".join(
+                f"{player.imie} {player.nazwisko}" for player in player_list
+            )
+        else:
+            self.player_low_id = self.player_high_id = None
+            self.display_name = ""
+
+    def __str__(self):
+        return self.display_name or self.INCOMPLETE_NAME
 
 
 class Tournament(models.Model):
@@ -172,6 +253,29 @@ class Tournament(models.Model):
         related_name="tournaments",
     )
 
+    class Meta:
+        indexes = [
+            # Kalendarz stronicowany po (date_of_beginning, id)
+            models.Index(
+                fields=["date_of_beginning", "id"],
+                name="tournament_calendar_idx",
+            ),
+            models.Index(
+                fields=["sex", "date_of_beginning", "id"],
+                name="tournament_sex_calendar_idx",
+            ),
+            # Filtr nadchodzących turniejów i zakresu dat
+            models.Index(
+                fields=["date_of_finishing"],
+                name="tournament_finishing_idx",
+            ),
+            # Turnieje organizatora, od najnowszego
+            models.Index(
+                fields=["user", "-id"],
+                name="tournament_user_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -191,12 +295,132 @@ class PlayerTournamentResult(models.Model):
     tournament_date = models.DateField()  # Data zakończenia turnieju
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # Jeden wynik zawodnika w turnieju
+            models.UniqueConstraint(
+                fields=["player", "tournament"],
+                name="unique_player_tournament_result",
+            ),
+        ]
+        indexes = [
+            # Najnowsze wyniki zawodnika (odświeżanie punktów rankingowych)
+            models.Index(
+                fields=["player", "-tournament_date"],
+                include=["points_awarded"],
+                name="result_player_date_idx",
+            ),
+            # Wyniki z okna rankingu (pełne przeliczenie i backfill)
+            models.Index(
+                fields=["tournament_date"],
+                include=["player", "points_awarded"],
+                name="result_date_idx",
+            ),
+        ]
+
 
 class Ranking(models.Model):
     date = models.DateField()  # Data generacji rankingu
     gender = models.CharField(
         max_length=6, choices=User.Gender.choices
     )  # Płeć
-    rankings = (
-        models.JSONField()
-    )  # Słownik przechowujący ranking (np. {1: {'user_id': user_id, 'points': points}, ...})
+    updated_at = models.DateTimeField(auto_now=True)  # Ostatni zapis
+
+    class Meta:
+        constraints = [
+            # Jeden ranking kategorii na dzień; indeks czytany także wstecz
+            # dla order_by("-date")
+            models.UniqueConstraint(
+                fields=["gender", "date"],
+                name="unique_ranking_gender_date",
+            ),
+        ]
+
+
+class RankingEntry(models.Model):
+    """Position of a player in a ranking snapshot."""
+
+    snapshot = models.ForeignKey(
+        Ranking, on_delete=models.CASCADE, related_name="entries"
+    )
+    position = models.PositiveIntegerField()
+    player = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="ranking_entries"
+    )
+    points = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "position"],
+                name="unique_ranking_entry_position",
+            ),
+            models.UniqueConstraint(
+                fields=["snapshot", "player"],
+                name="unique_ranking_entry_player",
+            ),
+        ]
+        indexes = [
+            # Historia zawodnika czytana wyłącznie z indeksu
+            models.Index(
+                fields=["player", "snapshot"],
+                include=["position", "points"],
+                name="ranking_entry_history_idx",
+            ),
+        ]
+
+
+class PlayerRankingScore(models.Model):
+    """Current rolling-window ranking points of a player."""
+
+    player = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="ranking_score"
+    )
+    points = models.PositiveIntegerField(default=0)
+    # Ostatni dzień, w którym wynik jest aktualny (null - nie wygasa)
+    valid_until = models.DateField(null=True, blank=True)
+
+
+class Job(models.Model):
+    """Background job executed by the run_jobs command."""
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", ("W kolejce")
+        RUNNING = "RUNNING", ("W trakcie")
+        SUCCEEDED = "SUCCEEDED", ("Zakończone")
+        FAILED = "FAILED", ("Błąd")
+
+    kind = models.CharField(max_length=50)
+    status = models.CharField(
+        max_length=9,
+        choices=Status,
+        default=Status.QUEUED,
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # Procent
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Ostatni znak życia procesu wykonującego zadanie
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"], name="job_queue_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -0,0 +1,20 @@
+"""
+Serializer helpers shared by the apps.
+"""
+
+from core.middleware import current_timing
+
+
+class TimedSerializerMixin:
+    """Serializer mixin reporting its time in the serialize metric.
+
+    The time is measured by RequestTimingMiddleware and sent in the
+    Server-Timing header of the request.
+    """
+
+    def to_representation(self, instance):
+        timing = current_timing.get()
+        if timing is None:
+            return super().to_representation(instance)
+        with timing.serializing():
+            return super().to_representation(instance)
@@ -0,0 +1,93 @@
+"""
+Signal handlers keeping denormalized team data and caches in sync.
+"""
+
+from functools import partial
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.backends import user_cache_key
+from core.models import Team, User
+
+DISPLAY_FIELDS = ["player_ids", "display_name", "player_low", "player_high"]
+
+
+def save_display(team):
+    """Save the display data of a team.
+
+    When the pair already has another team, the pair key stays with that
+    team and this one is saved without it, instead of failing the change
+    of players on unique_team_pair.
+    """
+    try:
+        with transaction.atomic():
+            team.save(update_fields=DISPLAY_FIELDS)
+    except IntegrityError:
+        team.player_low = team.player_high = None
+        team.save(update_fields=DISPLAY_FIELDS)
+
+
+def refresh_teams(teams):
+    """Recompute the display data of teams, saving only the changed ones."""
+    changed = []
+    for team in teams.prefetch_related("players"):
+        display = (team.player_ids, team.display_name)
+        team.set_display(team.players.all())
+        # Klucz pary wynika z player_ids, więc wystarczy porównać te pola
+        if (team.player_ids, team.display_name) != display:
+            changed.append(team)
+    try:
+        with transaction.atomic():
+            Team.objects.bulk_update(changed, DISPLAY_FIELDS)
+    except IntegrityError:
+        for team in changed:
+            save_display(team)
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+def refresh_team_players(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh the display data of teams whose players changed."""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            instance.set_display(instance.players.all())
+            save_display(instance)
+        return
+
+    # Zmiana od strony zawodnika (user.teams) dotyczy wskazanych drużyn
+    if action == "pre_clear":
+        # Po wyczyszczeniu nie wiadomo już, których drużyn to dotyczyło
+        instance._cleared_team_ids = list(
+            instance.teams.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        refresh_teams(Team.objects.filter(pk__in=instance._cleared_team_ids))
+    elif action in ("post_add", "post_remove"):
+        refresh_teams(Team.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=User)
+def refresh_player_teams(sender, instance, created, update_fields, **kwargs):
+    """Refresh the display names of a player's teams after a rename."""
+    if created:
+        return
+    if update_fields is not None and not {"imie", "nazwisko"} & set(
+        update_fields
+    ):
+        return
+    refresh_teams(instance.teams.all())
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached user of authenticated requests.
+
+    The user is dropped again once the transaction commits, in case a
+    request cached the previous row in the meantime.
+    """
+    key = user_cache_key(instance.pk)
+    cache.delete(key)
+    transaction.on_commit(partial(cache.delete, key))
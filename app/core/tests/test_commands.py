@@ -1,10 +1,32 @@
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg import OperationalError as PsyCopg2OpError
 
+from django.db import connection
 from django.db.utils import OperationalError
 from django.core.management import call_command
-from django.test import SimpleTestCase
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.archive import ArchiveImport
+from core.management.commands.seed_data import clear_seed_data
+from core.models import (
+    Job,
+    PlayerRankingScore,
+    PlayerTournamentResult,
+    Ranking,
+    Team,
+    Tournament,
+    User,
+)
+
+import datetime
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -31,3 +53,373 @@ class CommandTest(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+@patch('job.queue.run_next')
+class RunJobsCommandTest(SimpleTestCase):
+    '''Test the background job worker command.'''
+
+    def test_run_jobs_once_drains_queue(self, patched_run_next):
+        """Test the worker runs jobs until the queue is empty."""
+        job = Job(kind='test', status=Job.Status.SUCCEEDED)
+        patched_run_next.side_effect = [job, job, None]
+
+        call_command('run_jobs', once=True)
+
+        self.assertEqual(patched_run_next.call_count, 3)
+
+
+class ComputeRankingsCommandTest(TestCase):
+    '''Test computing ranking snapshots from the command line.'''
+
+    def setUp(self):
+        organizer = User.objects.create_user(
+            'organizer@example.com', 'Test123', user_type='OR'
+        )
+        self.player = User.objects.create_user(
+            'player@example.com', 'Test123', user_type='PL', gender='MALE'
+        )
+        team = Team.objects.create()
+        team.players.add(self.player)
+        tournament = Tournament.objects.create(
+            user=organizer,
+            name='Cup',
+            tour_type='SR',
+            city='Sopot',
+            money_prize=1000,
+            sex='MALE',
+            date_of_beginning='2024-05-01',
+            date_of_finishing='2024-05-02',
+        )
+        PlayerTournamentResult.objects.create(
+            player=self.player,
+            tournament=tournament,
+            team=team,
+            points_awarded=100,
+            position=1,
+            tournament_date='2024-05-02',
+        )
+
+    def test_compute_rankings_as_of_date(self):
+        """Test snapshots are stored for the given date and gender."""
+        call_command(
+            'compute_rankings', as_of=datetime.date(2024, 6, 1),
+            gender=['MALE'], workers=1,
+        )
+
+        ranking = Ranking.objects.get()
+        self.assertEqual(ranking.date, datetime.date(2024, 6, 1))
+        self.assertEqual(ranking.gender, 'MALE')
+        self.assertEqual(ranking.entries.get().points, 100)
+
+    def test_compute_rankings_before_results(self):
+        """Test results after the as-of date are not counted."""
+        call_command(
+            'compute_rankings', as_of=datetime.date(2024, 4, 1), workers=1
+        )
+
+        self.assertEqual(Ranking.objects.count(), 2)
+        self.assertEqual(
+            Ranking.objects.get(gender='MALE').entries.get().points, 0
+        )
+
+    def test_compute_rankings_backfill(self):
+        """Test backfilling weekly snapshots over a date range."""
+        call_command(
+            'compute_rankings', date_from=datetime.date(2024, 4, 26),
+            as_of=datetime.date(2024, 5, 10), gender=['MALE'], workers=1,
+        )
+
+        rankings = Ranking.objects.order_by('date')
+        self.assertEqual(
+            [ranking.date for ranking in rankings],
+            [
+                datetime.date(2024, 4, 26),
+                datetime.date(2024, 5, 3),
+                datetime.date(2024, 5, 10),
+            ],
+        )
+        self.assertEqual(
+            [ranking.entries.get().points for ranking in rankings],
+            [0, 100, 100],
+        )
+
+
+class SeedDataCommandTest(TestCase):
+    '''Test generating a synthetic federation.'''
+
+    def seed(self, **options):
+        call_command(
+            'seed_data', players=20, organizers=2, tournaments=10, teams=4,
+            stdout=StringIO(), **options,
+        )
+
+    def test_seed_data(self):
+        """Test players, teams, tournaments and results are generated."""
+        self.seed()
+
+        self.assertEqual(User.objects.filter(user_type='PL').count(), 20)
+        self.assertEqual(Team.objects.count(), 10)
+        self.assertEqual(Tournament.objects.count(), 10)
+        for tournament in Tournament.objects.prefetch_related('teams'):
+            teams = list(tournament.teams.all())
+            self.assertEqual(len(teams), 4)
+            self.assertTrue(
+                all(
+                    player.gender == tournament.sex
+                    for team in teams
+                    for player in team.players.all()
+                )
+            )
+        # Wyniki tylko dla zakończonych turniejów, po jednym na zawodnika
+        finished = Tournament.objects.filter(
+            date_of_finishing__lte=timezone.now().date()
+        )
+        self.assertEqual(
+            PlayerTournamentResult.objects.count(), finished.count() * 8
+        )
+        self.assertEqual(Ranking.objects.count(), 2)
+
+    def test_seed_data_is_reproducible(self):
+        """Test the same seed generates the same federation."""
+        self.seed(seed=7)
+        first = list(
+            Tournament.objects.order_by('id').values_list(
+                'name', 'city', 'sex', 'date_of_beginning'
+            )
+        )
+
+        self.seed(seed=7, clear=True)
+        second = list(
+            Tournament.objects.order_by('id').values_list(
+                'name', 'city', 'sex', 'date_of_beginning'
+            )
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(Tournament.objects.count(), 10)
+        self.assertEqual(Team.objects.count(), 10)
+
+    def test_seed_data_clear(self):
+        """Test clearing deletes the generated data in bulk."""
+        player = User.objects.create_user(
+            email='player@example.com', password='testpass123'
+        )
+        queries = []
+        for size in (1, 2):
+            call_command(
+                'seed_data', players=20 * size, organizers=2,
+                tournaments=10 * size, teams=4, stdout=StringIO(),
+            )
+            # Zawodnik z punktami, ale bez wyników w turniejach
+            PlayerRankingScore.objects.create(
+                player=User.objects.create_user(
+                    email=f'seed-extra{size}@example.com',
+                    password='testpass123',
+                )
+            )
+            with CaptureQueriesContext(connection) as captured:
+                clear_seed_data()
+            queries.append(len(captured))
+            # Klucze obce są sprawdzane dopiero przy zatwierdzeniu
+            connection.check_constraints()
+
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(list(User.objects.all()), [player])
+        self.assertFalse(Team.objects.exists())
+        self.assertFalse(Tournament.objects.exists())
+        self.assertFalse(PlayerTournamentResult.objects.exists())
+        self.assertFalse(Team.players.through.objects.exists())
+
+    def test_seed_data_twice_requires_clear(self):
+        """Test generated data is not duplicated by accident."""
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+class BenchmarkCommandTest(TestCase):
+    '''Test benchmarking the key endpoints.'''
+
+    def setUp(self):
+        call_command(
+            'seed_data', players=20, organizers=1, tournaments=5, teams=4,
+            stdout=StringIO(),
+        )
+
+    def test_benchmark_report(self):
+        """Test every scenario is timed and its queries counted."""
+        results = PlayerTournamentResult.objects.count()
+        rankings = Ranking.objects.count()
+        output = StringIO()
+
+        call_command(
+            'benchmark', iterations=2, warmup=0, stdout=output,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['dataset']['players'], 20)
+        self.assertEqual(
+            set(report['scenarios']),
+            {
+                'public-tournaments',
+                'last-ranking',
+                'last-ranking-uncached',
+                'ranking-create',
+                'award-points',
+                'create-team',
+            },
+        )
+        for result in report['scenarios'].values():
+            self.assertLess(result['status'], 400)
+            self.assertGreater(result['queries'], 0)
+            self.assertLessEqual(result['min_ms'], result['max_ms'])
+        # Wygenerowanie rankingu mierzone osobno od kolejkowania
+        job = report['scenarios']['ranking-create']['job']
+        self.assertGreater(job['queries'], 0)
+        self.assertLessEqual(job['min_ms'], job['max_ms'])
+        self.assertNotIn('job', report['scenarios']['award-points'])
+        # Zapisy benchmarku są wycofywane
+        self.assertEqual(PlayerTournamentResult.objects.count(), results)
+        self.assertEqual(Ranking.objects.count(), rankings)
+        self.assertFalse(Job.objects.exists())
+
+    def test_benchmark_baseline(self):
+        """Test a report is compared with a baseline report."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            call_command(
+                'benchmark', scenario=['public-tournaments'], iterations=1,
+                output=path, stdout=StringIO(),
+            )
+            output = StringIO()
+
+            call_command(
+                'benchmark', scenario=['public-tournaments'], iterations=1,
+                baseline=path, output=path, stdout=output,
+            )
+
+        self.assertIn('public-tournaments: median', output.getvalue())
+        self.assertIn('queries 1 -> 1', output.getvalue())
+
+    def test_benchmark_unknown_scenario(self):
+        """Test an unknown scenario name is rejected."""
+        with self.assertRaises(CommandError):
+            call_command('benchmark', scenario=['missing'])
+
+
+class ImportArchiveCommandTest(TestCase):
+    '''Test importing the federation archive from CSV files.'''
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.organizer = User.objects.create_user(
+            'organizer@example.com', 'Test123', user_type='OR'
+        )
+        self.existing = User.objects.create_user(
+            'existing@example.com', 'Test123', user_type='PL',
+            gender='MALE', imie='Jan', nazwisko='Kowalski',
+        )
+
+    def write_csv(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def import_archive(self, players, tournaments, results):
+        call_command(
+            'import_archive',
+            players=self.write_csv('players.csv', players),
+            tournaments=self.write_csv('tournaments.csv', tournaments),
+            results=self.write_csv('results.csv', results),
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+
+    def test_import_archive(self):
+        """Test players, tournaments, teams and results are loaded."""
+        self.import_archive(
+            'email;imie;nazwisko;gender\n'
+            'a@example.com;Adam;Nowak;MALE\n'
+            'b@example.com;Bartek;Lis;MALE\n'
+            'c@example.com;Cezary;Wilk;MALE\n'
+            'existing@example.com;Inny;Gracz;MALE\n',
+            'ref,organizer,name,tour_type,city,money_prize,sex,'
+            'date_of_beginning,date_of_finishing\n'
+            't1,organizer@example.com,Cup,SR,Sopot,1000,MALE,'
+            '2024-05-01,2024-05-02\n'
+            't2,organizer@example.com,Open,MA,Gdynia,500,MALE,'
+            '2024-06-01,2024-06-01\n',
+            'tournament,player1,player2,position,points\n'
+            't1,a@example.com,b@example.com,1,100\n'
+            't1,c@example.com,existing@example.com,2,60\n'
+            't2,b@example.com,a@example.com,1,100\n',
+        )
+
+        self.assertEqual(User.objects.filter(user_type='PL').count(), 4)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.imie, 'Jan')
+        # Ta sama para w dwóch turniejach to jedna drużyna
+        self.assertEqual(Team.objects.count(), 2)
+        team = Team.objects.get(player_low=self.existing)
+        self.assertEqual(str(team), 'Jan Kowalski & Cezary Wilk')
+        self.assertCountEqual(
+            team.players.values_list('email', flat=True),
+            ['c@example.com', 'existing@example.com'],
+        )
+        cup = Tournament.objects.get(name='Cup')
+        self.assertEqual(cup.user, self.organizer)
+        self.assertEqual(cup.teams.count(), 2)
+        self.assertEqual(PlayerTournamentResult.objects.count(), 6)
+        result = PlayerTournamentResult.objects.get(
+            tournament=cup, player__email='c@example.com'
+        )
+        self.assertEqual(result.points_awarded, 60)
+        self.assertEqual(result.tournament_date, datetime.date(2024, 5, 2))
+        player = User.objects.get(email='a@example.com')
+        self.assertFalse(player.has_usable_password())
+        self.assertEqual(player.ranking_score.points, 0)
+
+    def test_import_archive_invalid_rows(self):
+        """Test nothing is imported when any row is invalid."""
+        with self.assertRaises(CommandError):
+            self.import_archive(
+                'email,imie,nazwisko,gender\n'
+                'a@example.com,Anna,Nowak,FEMALE\n',
+                'ref,organizer,name,tour_type,city,money_prize,sex,'
+                'date_of_beginning,date_of_finishing\n'
+                't1,organizer@example.com,Cup,SR,Sopot,1000,MALE,'
+                '2024-05-01,2024-05-02\n',
+                'tournament,player1,player2,position,points\n'
+                't1,a@example.com,existing@example.com,1,100\n'
+                't2,missing@example.com,existing@example.com,1,100\n',
+            )
+
+        self.assertFalse(User.objects.filter(email='a@example.com').exists())
+        self.assertFalse(Tournament.objects.exists())
+
+    def test_invalid_tournament_is_not_kept(self):
+        """Test a tournament with an invalid choice is left out."""
+        archive = ArchiveImport()
+        archive.read_tournaments(self.write_csv(
+            'tournaments.csv',
+            'ref,organizer,name,tour_type,city,money_prize,sex,'
+            'date_of_beginning,date_of_finishing\n'
+            't1,organizer@example.com,Cup,XX,Sopot,1000,MALE,'
+            '2024-05-01,2024-05-02\n',
+        ))
+
+        self.assertEqual(len(archive.errors), 1)
+        self.assertEqual(archive.tournaments, {})
+
+    def test_import_archive_missing_columns(self):
+        """Test a file without the required columns is rejected."""
+        with self.assertRaisesMessage(CommandError, 'missing columns'):
+            call_command(
+                'import_archive',
+                players=self.write_csv('players.csv', 'email,imie\n'),
+            )
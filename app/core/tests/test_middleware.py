@@ -0,0 +1,95 @@
+"""
+Tests for the request timing middleware.
+"""
+
+import re
+import time
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.middleware import RequestTiming, current_timing
+from tournament.serializers import TeamSerializer
+
+PUBLIC_TOURNAMENTS_URL = reverse("tournament:public-tournament-list")
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    """Tests for the Server-Timing header and the request log."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_server_timing_header(self):
+        """Test the header reports db, app, serialize, render and total."""
+        with self.assertNumQueries(1):
+            res = self.client.get(PUBLIC_TOURNAMENTS_URL)
+
+        metrics = dict(
+            re.match(r"(\w+);dur=([\d.]+)", metric).groups()
+            for metric in res["Server-Timing"].split(", ")
+        )
+        self.assertEqual(
+            set(metrics), {"db", "app", "serialize", "render", "total"}
+        )
+        self.assertIn('desc="1 queries"', res["Server-Timing"])
+        self.assertGreaterEqual(
+            float(metrics["total"]),
+            float(metrics["db"])
+            + float(metrics["serialize"])
+            + float(metrics["render"]),
+        )
+
+    async def test_server_timing_header_async(self):
+        """Test queries of async views are counted under ASGI."""
+        res = await self.async_client.get(PUBLIC_TOURNAMENTS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('desc="1 queries"', res["Server-Timing"])
+
+    def test_request_log_line(self):
+        """Test each request is logged under its URL name."""
+        with self.assertLogs("core.middleware", "INFO") as logs:
+            self.client.get(PUBLIC_TOURNAMENTS_URL)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("view=tournament:public-tournament-list", logs.output[0])
+        self.assertIn("db_queries=1", logs.output[0])
+        self.assertIn("serialize_ms=", logs.output[0])
+
+    def test_unresolved_url(self):
+        """Test requests without a matching view are logged too."""
+        with self.assertLogs("core.middleware", "INFO") as logs:
+            res = self.client.get("/no-such-page/")
+
+        self.assertEqual(res.status_code, 404)
+        self.assertIn("view=- ", logs.output[0])
+
+
+class RequestTimingTests(SimpleTestCase):
+    """Tests for measuring the serialization of a request."""
+
+    def test_serializer_time_is_counted(self):
+        """Test serializers add their time to the serialize metric."""
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            TeamSerializer({"id": 1, "player_ids": [], "__str__": ""}).data
+        finally:
+            current_timing.reset(token)
+
+        self.assertGreater(timing.serialize, 0)
+
+    def test_nested_serialization_counted_once(self):
+        """Test nested blocks are counted once and queries are left out."""
+        timing = RequestTiming()
+
+        with timing.serializing():
+            with timing.serializing():
+                time.sleep(0.01)
+            timing.queries.duration += 0.01
+
+        self.assertGreaterEqual(timing.serialize, 0.0)
+        self.assertLess(timing.serialize, 0.015)
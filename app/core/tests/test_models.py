@@ -69,3 +69,106 @@ class ModelTests(TestCase):
         )
 
         self.assertEqual(str(tournament), tournament.name)
+
+
+class TeamDisplayTests(TestCase):
+    '''Tests for the display data stored on teams.'''
+
+    def setUp(self):
+        self.players = [
+            get_user_model().objects.create_user(
+                f'player{i}@example.com',
+                'testpass123',
+                imie='Gracz',
+                nazwisko=str(i),
+                user_type='PL',
+            )
+            for i in range(3)
+        ]
+        self.team = models.Team.objects.create()
+
+    def test_adding_players_sets_display(self):
+        '''Test adding players stores their ids and the team name.'''
+        self.team.players.set([self.players[1], self.players[0]])
+
+        team = models.Team.objects.get(pk=self.team.pk)
+        self.assertEqual(
+            team.player_ids, [self.players[0].id, self.players[1].id]
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(str(team), 'Gracz 0 & Gracz 1')
+
+    def test_incomplete_team(self):
+        '''Test a team without two players has the placeholder name.'''
+        self.team.players.set([self.players[0]])
+
+        team = models.Team.objects.get(pk=self.team.pk)
+        self.assertEqual(str(team), models.Team.INCOMPLETE_NAME)
+
+    def test_removing_and_clearing_players(self):
+        '''Test removing and clearing players updates the display.'''
+        self.team.players.set(self.players[:2])
+        self.team.players.remove(self.players[1])
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.player_ids, [self.players[0].id])
+
+        self.team.players.clear()
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.player_ids, [])
+        self.assertEqual(self.team.display_name, '')
+
+    def test_changes_from_player_side(self):
+        '''Test changing teams through the player updates the teams.'''
+        self.team.players.add(self.players[0])
+        self.players[1].teams.add(self.team)
+        self.team.refresh_from_db()
+        self.assertEqual(str(self.team), 'Gracz 0 & Gracz 1')
+
+        self.players[1].teams.clear()
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.player_ids, [self.players[0].id])
+
+    def test_renaming_player_updates_team(self):
+        '''Test renaming a player updates the names of their teams.'''
+        self.team.players.set(self.players[:2])
+        player = self.players[0]
+        player.imie = 'Zawodnik'
+        player.save()
+
+        self.team.refresh_from_db()
+        self.assertEqual(str(self.team), 'Zawodnik 0 & Gracz 1')
+
+    def test_deleting_player_keeps_team(self):
+        '''Test deleting a player keeps the team and the partner's data.'''
+        team = models.Team.objects.get_or_create_pair(
+            self.players[0].id, self.players[1].id
+        )
+
+        self.players[1].delete()
+
+        team.refresh_from_db()
+        self.assertEqual(team.player_low, self.players[0])
+        self.assertIsNone(team.player_high)
+        self.assertEqual(list(team.players.all()), [self.players[0]])
+
+    def test_repairing_players_of_existing_team(self):
+        '''Test giving a team the pair of another team keeps both teams.'''
+        pair = models.Team.objects.get_or_create_pair(
+            self.players[0].id, self.players[1].id
+        )
+
+        self.team.players.set(self.players[:2])
+        other = models.Team.objects.create()
+        other.players.add(self.players[0])
+        self.players[1].teams.add(other)
+
+        for team in (self.team, other):
+            team.refresh_from_db()
+            self.assertEqual(str(team), 'Gracz 0 & Gracz 1')
+            self.assertIsNone(team.player_low)
+        self.assertEqual(
+            models.Team.objects.get_or_create_pair(
+                self.players[1].id, self.players[0].id
+            ),
+            pair,
+        )
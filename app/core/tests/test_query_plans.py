@@ -0,0 +1,227 @@
+"""
+Query plan regression tests of the hot queries.
+"""
+
+import datetime
+import json
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from core.models import (
+    PlayerTournamentResult,
+    Ranking,
+    RankingEntry,
+    Team,
+    Tournament,
+    User,
+)
+from ranking import engine
+from user.views import search_players
+
+AS_OF = datetime.date(2024, 6, 1)
+# Rozmiary danych, przy których planista wybiera indeks zamiast
+# sekwencyjnego skanu tylko wtedy, gdy indeks rzeczywiście pomaga
+PLAYERS = 20000
+# Co która zawodniczka; kobiety są tu małą kategorią zawodników
+FEMALE_EVERY = 500
+ORGANIZERS = 40
+TOURNAMENTS = 2000
+PLAYERS_PER_TOURNAMENT = 10
+SNAPSHOTS = 520
+PLAYERS_PER_SNAPSHOT = 100
+# Wiersze jednego INSERT, poniżej limitu 65535 parametrów zapytania
+BATCH_SIZE = 2000
+
+
+def seq_scanned_tables(queryset):
+    """Return the tables read by sequential scans in a queryset's plan."""
+    # QuerySet.explain() nie obsługuje filtrów po funkcjach okna
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    tables = set()
+    nodes = [node["Plan"] for node in plan]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            tables.add(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return tables
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans of PostgreSQL")
+class QueryPlanTests(TestCase):
+    """Test the hot queries are served by their indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizers = User.objects.bulk_create(
+            User(email=f"organizer{i}@example.com", user_type="OR")
+            for i in range(ORGANIZERS)
+        )
+        cls.organizer = organizers[0]
+        players = User.objects.bulk_create(
+            (
+                User(
+                    email=f"player{i}@example.com",
+                    imie="Gracz",
+                    nazwisko=str(i),
+                    user_type="PL",
+                    gender="FEMALE" if i % FEMALE_EVERY == 0 else "MALE",
+                )
+                for i in range(PLAYERS)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        User.objects.create(
+            email="jan@example.com",
+            imie="Jan",
+            nazwisko="Kowalczyk",
+            user_type="PL",
+            gender="MALE",
+        )
+        men = [player for player in players if player.gender == "MALE"]
+        cls.player = men[0]
+        team = Team.objects.create()
+
+        # Turnieje organizatora zapisane jeden po drugim
+        tournaments = Tournament.objects.bulk_create(
+            (
+                Tournament(
+                    user=organizers[i * ORGANIZERS // TOURNAMENTS],
+                    name=f"Cup {i}",
+                    tour_type="SR",
+                    city="Sopot",
+                    money_prize=1000,
+                    sex="MALE",
+                    date_of_beginning=AS_OF - timedelta(days=2 * i + 1),
+                    date_of_finishing=AS_OF - timedelta(days=2 * i),
+                )
+                for i in range(TOURNAMENTS)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        # Wyniki z ponad dziesięciu lat, okno rankingu to ich niewielka część
+        PlayerTournamentResult.objects.bulk_create(
+            (
+                PlayerTournamentResult(
+                    player=men[(i * PLAYERS_PER_TOURNAMENT + j) % len(men)],
+                    tournament=tournament,
+                    team=team,
+                    points_awarded=(i * j) % 100,
+                    position=j + 1,
+                    tournament_date=tournament.date_of_finishing,
+                )
+                for i, tournament in enumerate(tournaments)
+                for j in range(PLAYERS_PER_TOURNAMENT)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        snapshots = Ranking.objects.bulk_create(
+            Ranking(gender="MALE", date=AS_OF - timedelta(days=7 * week))
+            for week in range(SNAPSHOTS)
+        )
+        RankingEntry.objects.bulk_create(
+            (
+                RankingEntry(
+                    snapshot=snapshot,
+                    position=position,
+                    player=player,
+                    points=0,
+                )
+                for snapshot in snapshots
+                for position, player in enumerate(
+                    men[:PLAYERS_PER_SNAPSHOT], start=1
+                )
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        with connection.cursor() as cursor:
+            # Świeżo wstawione wiersze czekają na liście oczekujących
+            # indeksów GIN, którą scala dopiero VACUUM; bez tego planista
+            # wycenia indeksy trigramowe jak pełny skan
+            cursor.execute(
+                "SELECT gin_clean_pending_list(indexrelid) FROM pg_index "
+                "JOIN pg_class ON pg_class.oid = indexrelid "
+                "JOIN pg_am ON pg_am.oid = pg_class.relam "
+                "WHERE pg_am.amname = 'gin'"
+            )
+            cursor.execute("ANALYZE")
+
+    def assertNoSeqScan(self, queryset, model):
+        table = model._meta.db_table
+        self.assertNotIn(
+            table, seq_scanned_tables(queryset), str(queryset.query)
+        )
+
+    def test_best_results_of_gender(self):
+        """Test the full ranking computation reads results by date."""
+        self.assertNoSeqScan(
+            engine.best_results(AS_OF, gender="MALE"), PlayerTournamentResult
+        )
+
+    def test_best_results_of_players(self):
+        """Test refreshing rolling scores reads results by player."""
+        self.assertNoSeqScan(
+            engine.best_results(AS_OF, player_ids=[self.player.id]),
+            PlayerTournamentResult,
+        )
+
+    def test_players_of_category(self):
+        """Test the players of a category are read by type and gender."""
+        self.assertNoSeqScan(
+            User.objects.filter(
+                user_type=User.UserType.PLAYER, gender="FEMALE"
+            ).values_list("id", "imie", "nazwisko"),
+            User,
+        )
+
+    def test_upcoming_calendar(self):
+        """Test the public calendar page is read by dates."""
+        self.assertNoSeqScan(
+            Tournament.objects.filter(
+                date_of_finishing__gte=AS_OF - timedelta(days=30)
+            ).order_by("date_of_beginning", "id")[:21],
+            Tournament,
+        )
+
+    def test_organizer_tournaments(self):
+        """Test an organizer's tournaments are read newest first."""
+        self.assertNoSeqScan(
+            Tournament.objects.filter(user=self.organizer).order_by("-id"),
+            Tournament,
+        )
+
+    def test_last_ranking(self):
+        """Test the last ranking of a gender is read by date."""
+        self.assertNoSeqScan(
+            Ranking.objects.filter(gender="MALE").order_by("-date")[:1],
+            Ranking,
+        )
+
+    def test_player_history(self):
+        """Test a player's ranking history is read by player."""
+        self.assertNoSeqScan(
+            RankingEntry.objects.filter(player=self.player).values_list(
+                "snapshot__date", "position", "points"
+            ),
+            RankingEntry,
+        )
+
+    def test_player_search(self):
+        """Test the typeahead search reads players by trigram indexes."""
+        self.assertNoSeqScan(
+            search_players(
+                User.objects.filter(
+                    user_type=User.UserType.PLAYER, gender="MALE"
+                ),
+                "kowalcz",
+            ),
+            User,
+        )
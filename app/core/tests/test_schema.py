@@ -0,0 +1,59 @@
+"""
+Tests for the OpenAPI schema.
+"""
+
+from django.test import SimpleTestCase
+from drf_spectacular.generators import SchemaGenerator
+
+
+class SchemaTests(SimpleTestCase):
+    """Tests for the async API views in the schema."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.schema = SchemaGenerator().get_schema(request=None, public=True)
+
+    def test_async_views_listed(self):
+        """Test the async API views are documented with their GET."""
+        for path in [
+            "/api/public-tournaments/",
+            "/api/public-tournaments/{id}/",
+            "/api/ranking/last-ranking/",
+            "/api/ranking/movement/",
+            "/api/ranking/history/",
+        ]:
+            self.assertEqual(list(self.schema["paths"][path]), ["get"])
+
+    def test_async_view_parameters(self):
+        """Test the query parameters and responses of an async view."""
+        operation = self.schema["paths"]["/api/ranking/movement/"]["get"]
+
+        parameters = {
+            parameter["name"]: parameter
+            for parameter in operation["parameters"]
+        }
+        self.assertTrue(parameters["gender"]["required"])
+        self.assertIn("since", parameters)
+        self.assertEqual(
+            operation["responses"]["200"]["content"]["application/json"],
+            {"schema": {"$ref": "#/components/schemas/RankingMovement"}},
+        )
+        self.assertIn("400", operation["responses"])
+
+    def test_public_calendar_paginated(self):
+        """Test the public calendar is documented as a paginated list."""
+        operation = self.schema["paths"]["/api/public-tournaments/"]["get"]
+
+        names = {parameter["name"] for parameter in operation["parameters"]}
+        self.assertTrue({"cursor", "upcoming", "fields"} <= names)
+        self.assertEqual(
+            operation["responses"]["200"]["content"]["application/json"],
+            {
+                "schema": {
+                    "$ref": "#/components/schemas/"
+                    "PaginatedTournamentSummaryList"
+                }
+            },
+        )
+        self.assertNotIn("security", operation)
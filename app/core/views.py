@@ -1,9 +1,50 @@
 """
-View for home page.
+View for home page and the base of async API views.
 """
 
 from django.shortcuts import render
+from django.views import View
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
 
 
 def home(request):
     return render(request, 'home.html')
+
+
+class AsyncAPIView(View):
+    """Base of the public read-only API views served asynchronously.
+
+    DRF views are synchronous, so under ASGI each of their requests holds
+    a worker thread until the response is sent. Subclasses implement an
+    async get() with the async ORM and return DRF responses, rendered as
+    JSON like the responses of the DRF views.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Request z DRF daje query_params, których używają serializery
+        self.request = request = Request(request)
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(
+                exc, {'view': self, 'request': request}
+            )
+            if response is None:
+                raise
+
+        if isinstance(response, Response):
+            renderer = JSONRenderer()
+            response.accepted_renderer = renderer
+            response.accepted_media_type = renderer.media_type
+            response.renderer_context = {
+                'view': self,
+                'request': request,
+                'response': response,
+            }
+        return response
@@ -0,0 +1,137 @@
+"""
+Database-backed queue of background jobs.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+# Zadanie bez znaku życia dłużej niż tyle uznajemy za porzucone przez
+# proces, który przerwał pracę; długie zadania wołają set_progress
+STALE_AFTER = timedelta(minutes=15)
+# Liczba uruchomień zadania, po której porzucone zadanie jest błędem
+MAX_ATTEMPTS = 3
+
+# Funkcje obsługujące zadania, zarejestrowane po nazwie rodzaju zadania
+_handlers = {}
+
+
+def register(kind):
+    """Register the decorated function as the handler of a job kind.
+
+    The handler receives the Job and returns a JSON-serializable result.
+    """
+
+    def decorator(handler):
+        _handlers[kind] = handler
+        return handler
+
+    return decorator
+
+
+def enqueue(kind, payload=None, user=None):
+    """Add a job to the queue and return it."""
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return Job.objects.create(
+        kind=kind, payload=payload or {}, created_by=user
+    )
+
+
+def requeue_stale():
+    """Return jobs abandoned by crashed workers to the queue.
+
+    A job is abandoned when it is running without a heartbeat for
+    STALE_AFTER. After MAX_ATTEMPTS runs it is marked as failed instead,
+    so a job crashing its worker is not retried forever. Returns the
+    number of requeued jobs.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING, heartbeat_at__lt=now - STALE_AFTER
+    )
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=Job.Status.FAILED,
+        error="The worker stopped while running the job.",
+        finished_at=now,
+    )
+    requeued = stale.update(
+        status=Job.Status.QUEUED,
+        started_at=None,
+        heartbeat_at=None,
+        progress=0,
+    )
+    if failed or requeued:
+        logger.warning(
+            "Requeued %s and failed %s abandoned jobs.", requeued, failed
+        )
+    return requeued
+
+
+def claim_next():
+    """Mark the oldest queued job as running and return it.
+
+    Locked rows are skipped, so several workers can poll the same queue.
+    """
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED)
+            .order_by("created_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.attempts += 1
+        job.save(
+            update_fields=["status", "started_at", "heartbeat_at", "attempts"]
+        )
+    return job
+
+
+def set_progress(job, progress):
+    """Store the progress of a running job, in percent.
+
+    The call also renews the heartbeat of the job, so it is not requeued
+    while it is still running.
+    """
+    job.progress = max(0, min(int(progress), 100))
+    job.heartbeat_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(
+        progress=job.progress, heartbeat_at=job.heartbeat_at
+    )
+
+
+def run(job):
+    """Execute a claimed job and store its result or error."""
+    try:
+        job.result = _handlers[job.kind](job)
+    except Exception as error:
+        logger.exception("Job %s failed.", job.pk)
+        job.status = Job.Status.FAILED
+        job.error = f"{type(error).__name__}: {error}"
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.progress = 100
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=["status", "result", "error", "progress", "finished_at"]
+    )
+    return job
+
+
+def run_next():
+    """Claim and execute the next queued job, if there is one."""
+    requeue_stale()
+    job = claim_next()
+    if job is not None:
+        run(job)
+    return job
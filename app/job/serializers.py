@@ -0,0 +1,42 @@
+"""
+Serializers for the job API.
+"""
+
+from rest_framework import serializers
+
+from core.models import Job
+from core.serializers import TimedSerializerMixin
+
+
+class JobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Serializer for the status of a background job."""
+
+    queued_seconds = serializers.SerializerMethodField()
+    run_seconds = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "progress",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "queued_seconds",
+            "run_seconds",
+        ]
+        read_only_fields = fields
+
+    def get_queued_seconds(self, obj):
+        if obj.started_at is None:
+            return None
+        return (obj.started_at - obj.created_at).total_seconds()
+
+    def get_run_seconds(self, obj):
+        if obj.started_at is None or obj.finished_at is None:
+            return None
+        return (obj.finished_at - obj.started_at).total_seconds()
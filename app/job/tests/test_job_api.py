@@ -0,0 +1,147 @@
+"""
+Tests for the job queue and job API.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Job
+from job import queue
+
+
+def create_user(**params):
+    """Create and return new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def detail_url(job_id):
+    """Return URL for job detail."""
+    return reverse("job:job-detail", args=[job_id])
+
+
+@queue.register("test.echo")
+def echo(job):
+    queue.set_progress(job, 50)
+    return job.payload
+
+
+@queue.register("test.fail")
+def fail(job):
+    raise RuntimeError("boom")
+
+
+class JobQueueTests(TestCase):
+    """Tests for running queued jobs."""
+
+    def test_run_next_executes_oldest_job(self):
+        """Test jobs are run in order and their result is stored."""
+        first = queue.enqueue("test.echo", {"value": 1})
+        queue.enqueue("test.echo", {"value": 2})
+
+        job = queue.run_next()
+
+        self.assertEqual(job.pk, first.pk)
+        first.refresh_from_db()
+        self.assertEqual(first.status, Job.Status.SUCCEEDED)
+        self.assertEqual(first.result, {"value": 1})
+        self.assertEqual(first.progress, 100)
+        self.assertIsNotNone(first.started_at)
+        self.assertIsNotNone(first.finished_at)
+
+    def test_failed_job_stores_error(self):
+        """Test an exception in a handler marks the job as failed."""
+        job = queue.enqueue("test.fail")
+
+        queue.run_next()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.error, "RuntimeError: boom")
+
+    def test_run_next_on_empty_queue(self):
+        """Test nothing happens when there are no queued jobs."""
+        self.assertIsNone(queue.run_next())
+
+    def test_enqueue_unknown_kind(self):
+        """Test queueing a job without a handler is rejected."""
+        with self.assertRaises(ValueError):
+            queue.enqueue("test.unknown")
+
+    def abandon(self, job):
+        """Mark a claimed job as left without a heartbeat by its worker."""
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - queue.STALE_AFTER * 2
+        )
+
+    def test_abandoned_job_is_requeued(self):
+        """Test a job of a crashed worker is run again."""
+        job = queue.enqueue("test.echo", {"value": 1})
+        queue.claim_next()
+        self.abandon(job)
+
+        self.assertEqual(queue.run_next().pk, job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_running_job_is_not_requeued(self):
+        """Test a job with a recent heartbeat stays with its worker."""
+        job = queue.enqueue("test.echo")
+        queue.claim_next()
+
+        self.assertEqual(queue.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+
+    def test_abandoned_job_fails_after_max_attempts(self):
+        """Test a job crashing its workers is not retried forever."""
+        job = queue.enqueue("test.echo")
+        Job.objects.filter(pk=job.pk).update(attempts=queue.MAX_ATTEMPTS - 1)
+        queue.claim_next()
+        self.abandon(job)
+
+        self.assertIsNone(queue.run_next())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+
+class JobAPITests(TestCase):
+    """Tests for the job status API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email="organizer@example.com",
+            password="testpass123",
+            user_type="OR",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_retrieve_job_status(self):
+        """Test returning status and timing of a finished job."""
+        job = queue.enqueue("test.echo", {"value": 1}, user=self.user)
+        queue.run_next()
+
+        res = self.client.get(detail_url(job.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["status"], Job.Status.SUCCEEDED)
+        self.assertEqual(res.data["result"], {"value": 1})
+        self.assertIsNotNone(res.data["run_seconds"])
+
+    def test_other_users_job_not_found(self):
+        """Test users cannot see jobs queued by someone else."""
+        other = create_user(email="other@example.com", password="test123")
+        job = queue.enqueue("test.echo", user=other)
+
+        res = self.client.get(detail_url(job.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,21 @@
+"""
+URLs for job API.
+"""
+
+from django.urls import (
+    include,
+    path,
+)
+
+from rest_framework.routers import DefaultRouter
+
+from job import views
+
+router = DefaultRouter()
+router.register("jobs", views.JobViewSet, basename="job")
+
+app_name = "job"
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -0,0 +1,23 @@
+"""
+Views for the job API.
+"""
+
+from rest_framework import mixins, viewsets
+from rest_framework.permissions import IsAuthenticated
+
+from core.models import Job
+from job.serializers import JobSerializer
+
+
+class JobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """View for checking the status of background jobs."""
+
+    serializer_class = JobSerializer
+    queryset = Job.objects.all()
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Retrieve jobs created by the authenticated user."""
+        if self.request.user.is_staff:
+            return self.queryset
+        return self.queryset.filter(created_by=self.request.user)
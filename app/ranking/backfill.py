@@ -0,0 +1,124 @@
+"""
+Sweep-line computation of historical ranking snapshots.
+"""
+
+import bisect
+from datetime import timedelta
+
+from django.db import transaction
+
+from core.models import (
+    PlayerTournamentResult,
+    Ranking,
+    RankingEntry,
+    User,
+)
+from ranking import cache as ranking_cache
+from ranking.engine import RESULTS_COUNTED, window_start
+
+# Liczba wierszy zapisywanych jednym zapytaniem
+BATCH_SIZE = 5000
+
+
+def snapshot_dates(start, end, every=7):
+    """Return the dates from start to end (inclusive) every N days."""
+    step = timedelta(days=every)
+    dates = []
+    while start <= end:
+        dates.append(start)
+        start += step
+    return dates
+
+
+def sweep_rankings(gender, dates):
+    """Yield (date, rows) leaderboards of a gender for sorted dates.
+
+    Results are read once, sorted by date, and swept forward in time.
+    Each player keeps the sorted points of the results inside the
+    ranking window; only players whose results entered or left the
+    window since the previous date have their score recomputed.
+    """
+    if not dates:
+        return
+
+    player_ids = list(
+        User.objects.filter(
+            gender=gender, user_type=User.UserType.PLAYER
+        ).values_list("id", flat=True)
+    )
+    results = list(
+        PlayerTournamentResult.objects.filter(
+            player__gender=gender,
+            player__user_type=User.UserType.PLAYER,
+            tournament_date__gte=window_start(dates[0]),
+            tournament_date__lte=dates[-1],
+        )
+        .order_by("tournament_date")
+        .values_list("tournament_date", "player_id", "points_awarded")
+    )
+
+    in_window = {player_id: [] for player_id in player_ids}
+    scores = dict.fromkeys(player_ids, 0)
+    added = expired = 0
+
+    for as_of in dates:
+        touched = set()
+
+        # Wyniki, które weszły do okna rankingu
+        while added < len(results) and results[added][0] <= as_of:
+            _, player_id, points = results[added]
+            bisect.insort(in_window[player_id], points)
+            touched.add(player_id)
+            added += 1
+
+        # Wyniki, które wypadły z okna rankingu
+        first_day = window_start(as_of)
+        while expired < added and results[expired][0] < first_day:
+            _, player_id, points = results[expired]
+            points_list = in_window[player_id]
+            del points_list[bisect.bisect_left(points_list, points)]
+            touched.add(player_id)
+            expired += 1
+
+        for player_id in touched:
+            scores[player_id] = sum(in_window[player_id][-RESULTS_COUNTED:])
+
+        yield as_of, [
+            {"user_id": player_id, "points": points}
+            for player_id, points in sorted(
+                scores.items(), key=lambda item: (-item[1], item[0])
+            )
+        ]
+
+
+@transaction.atomic
+def write_snapshots(gender, dates, snapshots):
+    """Replace the snapshots of a gender on the dates with (date, rows).
+
+    Snapshots are consumed one at a time and their entries are written in
+    batches, so the memory use does not grow with the number of dates.
+    """
+    Ranking.objects.filter(gender=gender, date__in=dates).delete()
+
+    written = 0
+    entries = []
+    for as_of, rows in snapshots:
+        ranking = Ranking.objects.create(date=as_of, gender=gender)
+        entries.extend(
+            RankingEntry(
+                snapshot=ranking,
+                position=position,
+                player_id=row["user_id"],
+                points=row["points"],
+            )
+            for position, row in enumerate(rows, start=1)
+        )
+        if len(entries) >= BATCH_SIZE:
+            RankingEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+            entries = []
+        written += 1
+    RankingEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+
+    # Wpisy zapisane po utworzeniu rankingów też muszą unieważnić cache
+    transaction.on_commit(lambda: ranking_cache.invalidate(gender))
+    return written
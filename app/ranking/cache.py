@@ -0,0 +1,119 @@
+"""
+Cache of rendered ranking responses.
+"""
+
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+# Odpowiedzi są unieważniane przy zapisie rankingu, więc mogą żyć długo
+RESPONSE_TIMEOUT = 60 * 60 * 24
+# Parametry zmieniające treść odpowiedzi, pozostałe są pomijane
+RESPONSE_PARAMS = (
+    "gender",
+    "since",
+    "player",
+    "around",
+    "top",
+    "limit",
+    "offset",
+)
+GENDERS = ("MALE", "FEMALE")
+
+
+def canonical_url(request):
+    """Return the URL of a request with only the response parameters.
+
+    Unknown parameters are dropped, so they neither create new cache
+    entries nor leak into the paging links of cached responses.
+    """
+    params = request.query_params
+    query = urlencode(
+        [(name, params[name]) for name in RESPONSE_PARAMS if name in params]
+    )
+    url = request.build_absolute_uri(request.path)
+    return f"{url}?{query}" if query else url
+
+
+def _version_key(gender):
+    return f"ranking:last:version:{gender}"
+
+
+async def _response_key(gender, request):
+    """Return the cache key of a last-ranking request for a gender.
+
+    Every key embeds the current version token of the gender, so changing
+    the token invalidates all cached pages of that gender at once.
+    """
+    version = await cache.aget_or_set(_version_key(gender), time.time_ns, None)
+    url = hashlib.sha1(canonical_url(request).encode()).hexdigest()
+    return f"ranking:last:{gender}:{version}:{url}"
+
+
+async def aget_response(gender, request):
+    """Return the cached payload and validators of a request, if any."""
+    return await cache.aget(await _response_key(gender, request))
+
+
+async def aset_response(gender, request, snapshot, data):
+    """Cache a rendered payload with its ETag and Last-Modified values."""
+    version = await cache.aget_or_set(_version_key(gender), time.time_ns, None)
+    token = (
+        f"{snapshot.pk}:{snapshot.updated_at.isoformat()}:{version}:"
+        f"{canonical_url(request)}"
+    )
+    cached = {
+        "data": data,
+        "etag": '"%s"' % hashlib.sha1(token.encode()).hexdigest(),
+        "last_modified": snapshot.updated_at.timestamp(),
+    }
+    await cache.aset(
+        await _response_key(gender, request), cached, RESPONSE_TIMEOUT
+    )
+    return cached
+
+
+async def _movement_key(current, previous, request):
+    """Return the cache key of a movement request for a snapshot pair.
+
+    The key embeds when both snapshots were last written, so rewriting
+    either of them makes the cached movement unreachable. It also embeds
+    the version token of the gender, dropped when a player is renamed.
+    """
+    version = await cache.aget_or_set(
+        _version_key(current.gender), time.time_ns, None
+    )
+    token = ":".join(
+        f"{snapshot.pk}@{snapshot.updated_at.timestamp()}"
+        for snapshot in (current, previous)
+    )
+    url = hashlib.sha1(canonical_url(request).encode()).hexdigest()
+    return f"ranking:movement:{version}:{token}:{url}"
+
+
+async def aget_movement(current, previous, request):
+    """Return the cached movement payload of a snapshot pair, if any."""
+    return await cache.aget(await _movement_key(current, previous, request))
+
+
+async def aset_movement(current, previous, request, data):
+    """Cache the movement payload of a snapshot pair."""
+    await cache.aset(
+        await _movement_key(current, previous, request),
+        data,
+        RESPONSE_TIMEOUT,
+    )
+
+
+def invalidate(gender):
+    """Drop every cached ranking response of a gender."""
+    cache.set(_version_key(gender), time.time_ns(), None)
+
+
+def invalidate_all():
+    """Drop every cached ranking response, e.g. after a player rename."""
+    cache.set_many(
+        {_version_key(gender): time.time_ns() for gender in GENDERS}, None
+    )
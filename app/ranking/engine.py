@@ -0,0 +1,208 @@
+"""
+Set-based ranking engine.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Min, Q, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+
+from core.models import (
+    PlayerRankingScore,
+    PlayerTournamentResult,
+    Ranking,
+    RankingEntry,
+    User,
+)
+
+# Liczba najlepszych wyników brana pod uwagę w rankingu
+RESULTS_COUNTED = 6
+# Okno czasowe, z którego brane są wyniki
+RANKING_WINDOW = timedelta(days=365)
+
+
+def window_start(as_of):
+    """Return the first day of the ranking window ending at as_of."""
+    return as_of - RANKING_WINDOW
+
+
+def best_results(as_of, gender=None, player_ids=None):
+    """Return (player_id, points, date) rows of every player's best results.
+
+    One windowed query numbers the results of each player inside the
+    ranking window, best first, and keeps RESULTS_COUNTED of them.
+    """
+    results = PlayerTournamentResult.objects.filter(
+        player__user_type=User.UserType.PLAYER,
+        tournament_date__gte=window_start(as_of),
+        tournament_date__lte=as_of,
+    )
+    if gender is not None:
+        results = results.filter(player__gender=gender)
+    if player_ids is not None:
+        results = results.filter(player_id__in=player_ids)
+
+    return (
+        results.annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F("player_id")],
+                order_by=[
+                    F("points_awarded").desc(),
+                    F("tournament_date").desc(),
+                    F("id").desc(),
+                ],
+            )
+        )
+        .filter(row_number__lte=RESULTS_COUNTED)
+        .values_list("player_id", "points_awarded", "tournament_date")
+    )
+
+
+def compute_ranking(gender, as_of=None):
+    """Return the ordered leaderboard of a gender as a list of dicts.
+
+    The query count does not depend on the number of players: one query
+    fetches the players with their names, one fetches the best results.
+    """
+    as_of = as_of or timezone.now().date()
+
+    players = User.objects.filter(
+        gender=gender, user_type=User.UserType.PLAYER
+    ).values_list("id", "imie", "nazwisko")
+    totals = {
+        player_id: {
+            "user_id": player_id,
+            "full_name": f"{imie} {nazwisko}",
+            "points": 0,
+        }
+        for player_id, imie, nazwisko in players
+    }
+
+    for player_id, points, _ in best_results(as_of, gender=gender):
+        totals[player_id]["points"] += points
+
+    return sorted(
+        totals.values(), key=lambda row: (-row["points"], row["user_id"])
+    )
+
+
+def refresh_scores(player_ids, as_of=None):
+    """Recompute the rolling ranking points of the given players.
+
+    The cost depends only on the number of given players, so it can run
+    in the same transaction that writes their new results.
+    """
+    as_of = as_of or timezone.now().date()
+    player_ids = set(player_ids)
+
+    scores = {
+        player_id: PlayerRankingScore(player_id=player_id)
+        for player_id in player_ids
+    }
+    for player_id, points, date in best_results(as_of, player_ids=player_ids):
+        score = scores[player_id]
+        score.points += points
+        # Wynik zmieni się, gdy najstarszy liczony turniej wypadnie z okna
+        expires = date + RANKING_WINDOW
+        if score.valid_until is None or expires < score.valid_until:
+            score.valid_until = expires
+
+    # Wyniki z przyszłą datą zaczną się liczyć dopiero po tej dacie
+    upcoming = (
+        PlayerTournamentResult.objects.filter(
+            player_id__in=player_ids, tournament_date__gt=as_of
+        )
+        .values("player_id")
+        .annotate(first_date=Min("tournament_date"))
+        .values_list("player_id", "first_date")
+    )
+    for player_id, first_date in upcoming:
+        score = scores[player_id]
+        last_valid_day = first_date - timedelta(days=1)
+        if score.valid_until is None or last_valid_day < score.valid_until:
+            score.valid_until = last_valid_day
+
+    PlayerRankingScore.objects.bulk_create(
+        scores.values(),
+        update_conflicts=True,
+        unique_fields=["player"],
+        update_fields=["points", "valid_until"],
+    )
+
+
+def current_ranking(gender, as_of=None):
+    """Return today's leaderboard of a gender from the rolling scores.
+
+    Only the players whose score has expired, or who have results but no
+    score yet, are recomputed before the leaderboard is read.
+    """
+    as_of = as_of or timezone.now().date()
+    players = User.objects.filter(
+        gender=gender, user_type=User.UserType.PLAYER
+    )
+
+    stale = (
+        players.filter(
+            Q(ranking_score__valid_until__lt=as_of)
+            | Q(
+                ranking_score__isnull=True,
+                tournament_results__isnull=False,
+            )
+        )
+        .distinct()
+        .values_list("id", flat=True)
+    )
+    stale = list(stale)
+    if stale:
+        refresh_scores(stale, as_of)
+
+    rows = players.annotate(
+        points=Coalesce(F("ranking_score__points"), 0)
+    ).values_list("id", "imie", "nazwisko", "points")
+    return sorted(
+        (
+            {
+                "user_id": player_id,
+                "full_name": f"{imie} {nazwisko}",
+                "points": points,
+            }
+            for player_id, imie, nazwisko, points in rows
+        ),
+        key=lambda row: (-row["points"], row["user_id"]),
+    )
+
+
+def write_snapshot(gender, as_of, rows):
+    """Store leaderboard rows as the snapshot of a gender and date."""
+    with transaction.atomic():
+        snapshot, _ = Ranking.objects.get_or_create(date=as_of, gender=gender)
+        snapshot.entries.all().delete()
+        RankingEntry.objects.bulk_create(
+            RankingEntry(
+                snapshot=snapshot,
+                position=position,
+                player_id=row["user_id"],
+                points=row["points"],
+            )
+            for position, row in enumerate(rows, start=1)
+        )
+        # Zapis odświeża updated_at i unieważnia cache ostatniego rankingu
+        snapshot.save()
+    return snapshot
+
+
+def create_snapshots(as_of=None, genders=None):
+    """Compute and store ranking snapshots, return them by gender."""
+    today = timezone.now().date()
+    as_of = as_of or today
+    genders = genders or User.Gender.values
+    # Ranking na dziś czytamy z utrzymywanych na bieżąco punktów
+    build = current_ranking if as_of == today else compute_ranking
+
+    return {
+        gender: write_snapshot(gender, as_of, build(gender, as_of))
+        for gender in genders
+    }
@@ -0,0 +1,21 @@
+"""
+Background jobs of the ranking app.
+"""
+
+from core.models import User
+from job import queue
+from ranking import engine
+
+CREATE_SNAPSHOTS = "ranking.create_snapshots"
+
+
+@queue.register(CREATE_SNAPSHOTS)
+def create_snapshots(job):
+    """Generate today's ranking snapshots, one gender at a time."""
+    genders = job.payload.get("genders") or User.Gender.values
+    snapshots = {}
+    for done, gender in enumerate(genders, start=1):
+        snapshot = engine.create_snapshots(genders=[gender])[gender]
+        snapshots[gender] = snapshot.pk
+        queue.set_progress(job, done * 100 / len(genders))
+    return {"snapshots": snapshots}
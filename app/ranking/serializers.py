@@ -1,12 +1,92 @@
-'''
+"""
 Serializers for ranking API.
-'''
+"""
 
 from rest_framework import serializers
-from core.models import Ranking
+from core.models import Ranking, RankingEntry
+from core.serializers import TimedSerializerMixin
 
 
-class RankingSerializer(serializers.ModelSerializer):
+class RankingEntrySerializer(serializers.ModelSerializer):
+    """Serializer for a single row of a ranking snapshot."""
+
+    user_id = serializers.IntegerField(source="player_id", read_only=True)
+    full_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RankingEntry
+        fields = ["position", "user_id", "full_name", "points"]
+
+    def get_full_name(self, obj):
+        return f"{obj.player.imie} {obj.player.nazwisko}"
+
+
+class RankingHistorySerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
+    """Serializer for a player's position in one ranking snapshot."""
+
+    date = serializers.DateField(source="snapshot.date", read_only=True)
+
+    class Meta:
+        model = RankingEntry
+        fields = ["date", "position", "points"]
+
+
+class RankingMovementEntrySerializer(RankingEntrySerializer):
+    """Serializer for a ranking row compared with an earlier snapshot."""
+
+    previous_position = serializers.IntegerField(read_only=True)
+    position_change = serializers.SerializerMethodField()
+    points_change = serializers.SerializerMethodField()
+
+    class Meta(RankingEntrySerializer.Meta):
+        fields = RankingEntrySerializer.Meta.fields + [
+            "previous_position",
+            "position_change",
+            "points_change",
+        ]
+
+    def get_position_change(self, obj):
+        """Return places gained (positive) or lost (negative)."""
+        if obj.previous_position is None:
+            return None
+        return obj.previous_position - obj.position
+
+    def get_points_change(self, obj):
+        if obj.previous_points is None:
+            return None
+        return obj.points - obj.previous_points
+
+
+class RankingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    rankings = serializers.SerializerMethodField()
+
+    entry_serializer_class = RankingEntrySerializer
+
     class Meta:
         model = Ranking
-        fields = ['date', 'gender', 'rankings']
+        fields = ["date", "gender", "rankings"]
+
+    def get_rankings(self, obj):
+        """Return the leaderboard keyed by position.
+
+        A slice of the leaderboard can be passed in the "entries" context.
+        """
+        entries = self.context.get("entries", obj.entries.all())
+        rows = self.entry_serializer_class(entries, many=True).data
+        return {row.pop("position"): row for row in rows}
+
+
+class RankingMovementSerializer(RankingSerializer):
+    """Serializer for a ranking compared with an earlier snapshot."""
+
+    previous_date = serializers.SerializerMethodField()
+
+    entry_serializer_class = RankingMovementEntrySerializer
+
+    class Meta(RankingSerializer.Meta):
+        fields = ["date", "previous_date", "gender", "rankings"]
+
+    def get_previous_date(self, obj):
+        return self.context["previous"].date
@@ -0,0 +1,55 @@
+"""
+Signal handlers keeping rolling ranking points and caches consistent.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import (
+    PlayerRankingScore,
+    PlayerTournamentResult,
+    Ranking,
+    User,
+)
+from ranking import cache as ranking_cache
+
+
+@receiver(post_save, sender=PlayerTournamentResult)
+@receiver(post_delete, sender=PlayerTournamentResult)
+def invalidate_player_score(sender, instance, **kwargs):
+    """Drop the score of a player whose result was written or deleted.
+
+    Players with results but without a score are recomputed the next time
+    the current ranking is read. award_points writes results in bulk and
+    refreshes the scores itself.
+    """
+    PlayerRankingScore.objects.filter(player_id=instance.player_id).delete()
+
+
+@receiver(post_save, sender=Ranking)
+@receiver(post_delete, sender=Ranking)
+def invalidate_last_ranking(sender, instance, **kwargs):
+    """Drop cached last-ranking responses when a snapshot changes.
+
+    The cache is dropped again once the transaction commits, in case a
+    request cached the previous snapshot in the meantime.
+    """
+    ranking_cache.invalidate(instance.gender)
+    transaction.on_commit(partial(ranking_cache.invalidate, instance.gender))
+
+
+@receiver(post_save, sender=User)
+def invalidate_player_names(
+    sender, instance, created, update_fields, **kwargs
+):
+    """Drop cached ranking responses showing a renamed player's name."""
+    if created:
+        return
+    if update_fields is not None and not {"imie", "nazwisko"} & set(
+        update_fields
+    ):
+        return
+    ranking_cache.invalidate_all()
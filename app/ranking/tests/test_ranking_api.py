@@ -2,22 +2,36 @@
 Tests for Ranking API.
 """
 
+import asyncio
+
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
+import datetime
 from datetime import timedelta
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import (
+    Job,
+    PlayerRankingScore,
     Ranking,
+    RankingEntry,
     PlayerTournamentResult,
     Team,
     Tournament,
 )
+from job import queue
+from ranking import backfill, engine
+
+# Cache w pamięci, jak Redis w produkcji, odczyty nie są zapytaniami SQL
+MEMORY_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
 
 
 def create_user(**params):
@@ -25,8 +39,24 @@ def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
+def create_tournament(user, date, **params):
+    """Create and return a one-day men's tournament finishing on date."""
+    defaults = {
+        "name": f"Tournament {date}",
+        "tour_type": "SR",
+        "city": "Sopot",
+        "money_prize": 1000,
+        "sex": "MALE",
+        "date_of_beginning": date,
+        "date_of_finishing": date,
+    }
+    defaults.update(params)
+    return Tournament.objects.create(user=user, **defaults)
+
+
 class RankingAPITestCase(TestCase):
     def setUp(self):
+        cache.clear()
         # Tworzenie przykładowych drużyn
         today = timezone.now().date()
 
@@ -118,12 +148,17 @@ class RankingAPITestCase(TestCase):
         )  # Upewnij się, że ta nazwa jest poprawna
         res = self.client.post(url)
 
-        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Ranking.objects.count(), 0)
 
-        self.assertEqual(
-            Ranking.objects.first().rankings["1"]["full_name"],
-            f"{self.maleuser3.imie} {self.maleuser3.nazwisko}",
-        )
+        queue.run_next()
+
+        job = Job.objects.get(id=res.data["job_id"])
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+
+        male_ranking = Ranking.objects.get(gender="MALE")
+        self.assertEqual(male_ranking.entries.first().player, self.maleuser3)
+        self.assertEqual(male_ranking.entries.count(), 4)
         self.assertEqual(
             Ranking.objects.count(), 2
         )  # Oczekujemy 2 rankingi (MALE i FEMALE)
@@ -133,12 +168,12 @@ class RankingAPITestCase(TestCase):
         url = reverse("ranking:ranking-get-last-ranking") + "?gender=MALE"
 
         # Tworzenie rankingu przed testem
-        Ranking.objects.create(
-            date="2024-01-01",
-            gender="MALE",
-            rankings={
-                1: {"user_id": self.team1.players.first().id, "points": 100}
-            },
+        ranking = Ranking.objects.create(date="2024-01-01", gender="MALE")
+        RankingEntry.objects.create(
+            snapshot=ranking,
+            position=1,
+            player=self.maleuser1,
+            points=100,
         )
 
         res = self.client.get(url)
@@ -147,6 +182,14 @@ class RankingAPITestCase(TestCase):
         self.assertIn(
             "rankings", res.data
         )  # Oczekujemy, że dane rankingu będą w odpowiedzi
+        self.assertEqual(
+            res.data["rankings"][1],
+            {
+                "user_id": self.maleuser1.id,
+                "full_name": "Jan Kowalski",
+                "points": 100,
+            },
+        )
 
     def test_get_last_ranking_invalid_gender(self):
         url = "/api/ranking/last-ranking/" + "?gender=INVALID"
@@ -163,3 +206,647 @@ class RankingAPITestCase(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(res.data, {"error": "No rankings found"})
+
+    def test_list_rankings_reads_new_snapshots(self):
+        """Test the ranking list is not cached between requests."""
+        self.client.force_authenticate(self.organizator)
+        url = reverse("ranking:ranking-list")
+        Ranking.objects.create(date="2024-01-01", gender="MALE")
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+        Ranking.objects.create(date="2024-01-08", gender="MALE")
+
+        self.assertEqual(len(self.client.get(url).data), 2)
+
+    def test_create_ranking_counts_best_six_results_in_window(self):
+        """Test only the six best results of the last year are counted."""
+        today = timezone.now().date()
+        for points in [10, 20, 30, 40, 50, 60, 70]:
+            date = today - timedelta(days=10)
+            PlayerTournamentResult.objects.create(
+                player=self.maleuser4,
+                tournament=create_tournament(self.organizator, date),
+                team=self.team2,
+                points_awarded=points,
+                position=1,
+                tournament_date=date,
+            )
+        date = today - timedelta(days=400)
+        PlayerTournamentResult.objects.create(
+            player=self.maleuser4,
+            tournament=create_tournament(self.organizator, date),
+            team=self.team2,
+            points_awarded=500,
+            position=1,
+            tournament_date=date,
+        )
+
+        rows = engine.compute_ranking("MALE", today)
+
+        self.assertEqual(rows[0]["user_id"], self.maleuser4.id)
+        self.assertEqual(rows[0]["points"], 70 + 60 + 50 + 40 + 30 + 20)
+        self.assertEqual(len(rows), 4)
+
+    def test_create_ranking_same_shape_for_both_genders(self):
+        """Test female rankings carry the same fields as male ones."""
+        create_user(
+            email="player5@example.com",
+            password="testpassword",
+            imie="Anna",
+            nazwisko="Nowak",
+            gender="FEMALE",
+            user_type="PL",
+        )
+        self.client.force_authenticate(self.organizator)
+
+        self.client.post(reverse("ranking:ranking-list"))
+        queue.run_next()
+
+        url = reverse("ranking:ranking-get-last-ranking")
+        female = self.client.get(url, {"gender": "FEMALE"}).data
+        male = self.client.get(url, {"gender": "MALE"}).data
+        self.assertEqual(female["rankings"][1]["full_name"], "Anna Nowak")
+        self.assertEqual(set(female["rankings"][1]), set(male["rankings"][1]))
+
+    def test_compute_ranking_query_count_is_constant(self):
+        """Test the number of queries does not grow with players."""
+        for i in range(10):
+            create_user(
+                email=f"extra{i}@example.com",
+                password="testpassword",
+                imie="Extra",
+                nazwisko=str(i),
+                gender="MALE",
+                user_type="PL",
+            )
+
+        with self.assertNumQueries(2):
+            engine.compute_ranking("MALE")
+
+
+class RollingRankingScoreTests(TestCase):
+    """Tests for rolling ranking points maintained by award_points."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.today = timezone.now().date()
+        self.organizer = create_user(
+            email="organizer@example.com",
+            password="testpassword",
+            user_type="OR",
+        )
+        self.player1 = create_user(
+            email="player1@example.com",
+            password="testpassword",
+            imie="Jan",
+            nazwisko="Nowak",
+            gender="MALE",
+            user_type="PL",
+        )
+        self.player2 = create_user(
+            email="player2@example.com",
+            password="testpassword",
+            imie="Piotr",
+            nazwisko="Nowak",
+            gender="MALE",
+            user_type="PL",
+        )
+        self.team = Team.objects.create()
+        self.team.players.set([self.player1, self.player2])
+        self.tournament = Tournament.objects.create(
+            user=self.organizer,
+            name="Tournament B",
+            tour_type="SR",
+            city="Gdańsk",
+            money_prize=1000,
+            sex="MALE",
+            date_of_beginning=self.today - timedelta(days=2),
+            date_of_finishing=self.today - timedelta(days=1),
+        )
+        self.tournament.teams.add(self.team)
+
+    def test_award_points_updates_player_scores(self):
+        """Test awarding points updates scores of the team's players."""
+        self.client.force_authenticate(self.organizer)
+        url = reverse(
+            "tournament:tournament-award-points",
+            kwargs={"pk": self.tournament.id},
+        )
+        payload = {"team_results": [{"team_id": self.team.id, "position": 1}]}
+
+        res = self.client.post(url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        scores = PlayerRankingScore.objects.filter(
+            player__in=[self.player1, self.player2]
+        )
+        self.assertEqual([score.points for score in scores], [100, 100])
+        self.assertEqual(
+            scores[0].valid_until,
+            self.tournament.date_of_finishing + engine.RANKING_WINDOW,
+        )
+
+    def test_current_ranking_matches_full_computation(self):
+        """Test the rolling leaderboard equals a full recomputation."""
+        PlayerTournamentResult.objects.create(
+            player=self.player2,
+            tournament=self.tournament,
+            team=self.team,
+            points_awarded=60,
+            position=2,
+            tournament_date=self.today - timedelta(days=1),
+        )
+
+        self.assertEqual(
+            engine.current_ranking("MALE"), engine.compute_ranking("MALE")
+        )
+        self.assertEqual(PlayerRankingScore.objects.get().points, 60)
+
+    def test_current_ranking_refreshes_expired_scores(self):
+        """Test scores whose results left the window are recomputed."""
+        PlayerRankingScore.objects.create(
+            player=self.player1,
+            points=100,
+            valid_until=self.today - timedelta(days=1),
+        )
+
+        rows = engine.current_ranking("MALE")
+
+        self.assertEqual([row["points"] for row in rows], [0, 0])
+        self.player1.ranking_score.refresh_from_db()
+        self.assertEqual(self.player1.ranking_score.points, 0)
+
+    def test_deleting_result_invalidates_score(self):
+        """Test deleting a tournament drops the scores of its players."""
+        result = PlayerTournamentResult.objects.create(
+            player=self.player1,
+            tournament=self.tournament,
+            team=self.team,
+            points_awarded=100,
+            position=1,
+            tournament_date=self.today - timedelta(days=1),
+        )
+        engine.refresh_scores([self.player1.id])
+
+        result.delete()
+
+        self.assertFalse(PlayerRankingScore.objects.exists())
+        self.assertEqual(engine.current_ranking("MALE")[0]["points"], 0)
+
+    def test_saving_result_invalidates_score(self):
+        """Test a result written outside award_points is counted."""
+        engine.refresh_scores([self.player1.id])
+        self.assertEqual(PlayerRankingScore.objects.get().points, 0)
+
+        result = PlayerTournamentResult.objects.create(
+            player=self.player1,
+            tournament=self.tournament,
+            team=self.team,
+            points_awarded=100,
+            position=1,
+            tournament_date=self.today - timedelta(days=1),
+        )
+
+        self.assertFalse(PlayerRankingScore.objects.exists())
+        self.assertEqual(engine.current_ranking("MALE")[0]["points"], 100)
+
+        result.points_awarded = 60
+        result.save()
+
+        self.assertEqual(engine.current_ranking("MALE")[0]["points"], 60)
+
+
+@override_settings(CACHES=MEMORY_CACHE)
+class LastRankingPagingTests(TestCase):
+    """Tests for slicing the last ranking."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("ranking:ranking-get-last-ranking")
+        self.ranking = Ranking.objects.create(date="2024-01-01", gender="MALE")
+        self.players = [
+            create_user(
+                email=f"player{i}@example.com",
+                password="testpassword",
+                imie="Gracz",
+                nazwisko=str(i),
+                gender="MALE",
+                user_type="PL",
+            )
+            for i in range(1, 21)
+        ]
+        RankingEntry.objects.bulk_create(
+            RankingEntry(
+                snapshot=self.ranking,
+                position=position,
+                player=player,
+                points=1000 - position,
+            )
+            for position, player in enumerate(self.players, start=1)
+        )
+
+    def test_limit_and_offset(self):
+        """Test returning one page of the ranking with paging links."""
+        res = self.client.get(
+            self.url, {"gender": "MALE", "limit": 5, "offset": 5}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(res.data["rankings"]), [6, 7, 8, 9, 10])
+        self.assertEqual(res.data["count"], 20)
+        self.assertIn("offset=10", res.data["next"])
+        self.assertIn("offset=0", res.data["previous"])
+
+    def test_last_page_has_no_next_link(self):
+        """Test the last page does not link to a next one."""
+        res = self.client.get(
+            self.url, {"gender": "MALE", "limit": 10, "offset": 10}
+        )
+
+        self.assertEqual(len(res.data["rankings"]), 10)
+        self.assertIsNone(res.data["next"])
+
+    def test_top(self):
+        """Test returning the top N players."""
+        res = self.client.get(self.url, {"gender": "MALE", "top": 3})
+
+        self.assertEqual(list(res.data["rankings"]), [1, 2, 3])
+        self.assertEqual(
+            res.data["rankings"][1]["user_id"], self.players[0].id
+        )
+
+    def test_player_with_neighbours(self):
+        """Test returning a player's row with the rows around it."""
+        player = self.players[9]
+
+        res = self.client.get(
+            self.url, {"gender": "MALE", "player": player.id, "around": 2}
+        )
+
+        self.assertEqual(list(res.data["rankings"]), [8, 9, 10, 11, 12])
+        self.assertEqual(res.data["rankings"][10]["user_id"], player.id)
+
+    def test_player_not_ranked(self):
+        """Test asking for a player missing from the ranking gives 404."""
+        res = self.client.get(self.url, {"gender": "MALE", "player": 9999})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_limit(self):
+        """Test a negative or zero limit is rejected."""
+        for limit in (-1, 0):
+            res = self.client.get(self.url, {"gender": "MALE", "limit": limit})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(res.data, {"error": "Invalid limit parameter"})
+
+    def test_page_query_count(self):
+        """Test a page is read without loading the whole leaderboard."""
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {"gender": "MALE", "limit": 5})
+
+
+@override_settings(CACHES=MEMORY_CACHE)
+class LastRankingCacheTests(TestCase):
+    """Tests for caching of the last ranking."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("ranking:ranking-get-last-ranking")
+        self.player = create_user(
+            email="player1@example.com",
+            password="testpassword",
+            imie="Jan",
+            nazwisko="Kowalski",
+            gender="MALE",
+            user_type="PL",
+        )
+        engine.write_snapshot(
+            "MALE",
+            datetime.date(2024, 1, 1),
+            [{"user_id": self.player.id, "points": 100}],
+        )
+
+    def test_cached_response_makes_no_queries(self):
+        """Test a repeated request is served from the cache."""
+        first = self.client.get(self.url, {"gender": "MALE"})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {"gender": "MALE"})
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertIn("Last-Modified", second)
+
+    async def test_concurrent_readers_share_cache(self):
+        """Test concurrent readers of the async view get the same ranking."""
+        responses = await asyncio.gather(
+            *(
+                self.async_client.get(self.url, {"gender": "MALE"})
+                for _ in range(5)
+            )
+        )
+
+        for res in responses:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res["ETag"], responses[0]["ETag"])
+            self.assertEqual(res.json()["rankings"]["1"]["points"], 100)
+
+    def test_conditional_get_returns_not_modified(self):
+        """Test a matching If-None-Match gives 304 without queries."""
+        res = self.client.get(self.url, {"gender": "MALE"})
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                self.url, {"gender": "MALE"}, HTTP_IF_NONE_MATCH=res["ETag"]
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_snapshot_invalidates_cache(self):
+        """Test writing a snapshot changes the cached response."""
+        first = self.client.get(self.url, {"gender": "MALE"})
+
+        engine.write_snapshot(
+            "MALE",
+            datetime.date(2024, 2, 1),
+            [{"user_id": self.player.id, "points": 200}],
+        )
+        res = self.client.get(
+            self.url, {"gender": "MALE"}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], first["ETag"])
+        self.assertEqual(res.data["rankings"][1]["points"], 200)
+
+    def test_unknown_parameters_share_cache_entry(self):
+        """Test unknown parameters neither add entries nor reach links."""
+        first = self.client.get(
+            self.url, {"gender": "MALE", "limit": 1, "x": 1}
+        )
+
+        with self.assertNumQueries(0):
+            second = self.client.get(
+                self.url, {"gender": "MALE", "limit": 1, "x": 2}
+            )
+
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertIsNone(first.data["previous"])
+        self.assertNotIn("x=", str(first.data))
+
+    def test_player_rename_invalidates_cache(self):
+        """Test a renamed player is shown with the new name."""
+        self.client.get(self.url, {"gender": "MALE"})
+
+        self.player.nazwisko = "Nowak"
+        self.player.save()
+        res = self.client.get(self.url, {"gender": "MALE"})
+
+        self.assertEqual(res.data["rankings"][1]["full_name"], "Jan Nowak")
+
+    def test_login_keeps_cache(self):
+        """Test saving only the last login keeps cached responses."""
+        self.client.get(self.url, {"gender": "MALE"})
+
+        self.player.save(update_fields=["last_login"])
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"gender": "MALE"})
+
+
+class SweepBackfillTests(TestCase):
+    """Tests for the sweep-line historical backfill."""
+
+    def setUp(self):
+        cache.clear()
+        organizer = create_user(
+            email="organizer@example.com",
+            password="testpassword",
+            user_type="OR",
+        )
+        self.players = [
+            create_user(
+                email=f"player{i}@example.com",
+                password="testpassword",
+                imie="Gracz",
+                nazwisko=str(i),
+                gender="MALE",
+                user_type="PL",
+            )
+            for i in range(4)
+        ]
+        team = Team.objects.create()
+        start = datetime.date(2022, 1, 1)
+        results = []
+        for i in range(80):
+            date = start + timedelta(days=i * 11)
+            results.append(
+                PlayerTournamentResult(
+                    player=self.players[i % 4],
+                    tournament=create_tournament(organizer, date),
+                    team=team,
+                    points_awarded=(i * 37) % 100,
+                    position=1,
+                    tournament_date=date,
+                )
+            )
+        PlayerTournamentResult.objects.bulk_create(results)
+
+    def test_sweep_matches_full_computation(self):
+        """Test every swept snapshot equals a full recomputation."""
+        dates = backfill.snapshot_dates(
+            datetime.date(2022, 6, 1), datetime.date(2024, 6, 1), every=30
+        )
+
+        for as_of, rows in backfill.sweep_rankings("MALE", dates):
+            expected = [
+                {"user_id": row["user_id"], "points": row["points"]}
+                for row in engine.compute_ranking("MALE", as_of)
+            ]
+            self.assertEqual(rows, expected, as_of)
+
+    def test_write_snapshots_replaces_existing(self):
+        """Test backfilled snapshots replace snapshots on the same dates."""
+        dates = backfill.snapshot_dates(
+            datetime.date(2023, 1, 1), datetime.date(2023, 1, 15)
+        )
+        engine.write_snapshot("MALE", dates[0], [])
+
+        written = backfill.write_snapshots(
+            "MALE", dates, backfill.sweep_rankings("MALE", dates)
+        )
+
+        self.assertEqual(written, 3)
+        self.assertEqual(Ranking.objects.count(), 3)
+        self.assertEqual(
+            RankingEntry.objects.filter(snapshot__date=dates[0]).count(), 4
+        )
+
+
+@override_settings(CACHES=MEMORY_CACHE)
+class RankingMovementTests(TestCase):
+    """Tests for comparing the last ranking with an earlier one."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("ranking:ranking-get-movement")
+        self.players = [
+            create_user(
+                email=f"player{i}@example.com",
+                password="testpassword",
+                imie="Gracz",
+                nazwisko=str(i),
+                gender="MALE",
+                user_type="PL",
+            )
+            for i in range(3)
+        ]
+        a, b, c = (player.id for player in self.players)
+        engine.write_snapshot(
+            "MALE",
+            datetime.date(2024, 1, 1),
+            [{"user_id": a, "points": 50}, {"user_id": b, "points": 40}],
+        )
+        engine.write_snapshot(
+            "MALE",
+            datetime.date(2024, 2, 1),
+            [{"user_id": b, "points": 90}, {"user_id": a, "points": 60}],
+        )
+        engine.write_snapshot(
+            "MALE",
+            datetime.date(2024, 3, 1),
+            [
+                {"user_id": c, "points": 120},
+                {"user_id": a, "points": 100},
+                {"user_id": b, "points": 90},
+            ],
+        )
+
+    def test_movement_against_previous_snapshot(self):
+        """Test deltas are computed against the previous snapshot."""
+        res = self.client.get(self.url, {"gender": "MALE"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["previous_date"], datetime.date(2024, 2, 1))
+        rankings = res.data["rankings"]
+        self.assertIsNone(rankings[1]["previous_position"])
+        self.assertIsNone(rankings[1]["position_change"])
+        self.assertEqual(rankings[2]["position_change"], 0)
+        self.assertEqual(rankings[2]["points_change"], 40)
+        self.assertEqual(rankings[3]["position_change"], -2)
+        self.assertEqual(rankings[3]["points_change"], 0)
+
+    def test_movement_since_date(self):
+        """Test comparing with the last snapshot on or before a date."""
+        res = self.client.get(
+            self.url, {"gender": "MALE", "since": "2024-01-15"}
+        )
+
+        self.assertEqual(res.data["previous_date"], datetime.date(2024, 1, 1))
+        self.assertEqual(res.data["rankings"][2]["position_change"], -1)
+        self.assertEqual(res.data["rankings"][3]["position_change"], -1)
+
+    def test_movement_without_earlier_snapshot(self):
+        """Test 404 when there is nothing to compare with."""
+        res = self.client.get(
+            self.url, {"gender": "MALE", "since": "2023-01-01"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_movement_is_cached_per_snapshot_pair(self):
+        """Test a repeated movement request skips the entries query."""
+        self.client.get(self.url, {"gender": "MALE", "top": 2})
+
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url, {"gender": "MALE", "top": 2})
+
+        self.assertEqual(list(res.data["rankings"]), [1, 2])
+
+
+class RankingHistoryTests(TestCase):
+    """Tests for a player's ranking history."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("ranking:ranking-get-history")
+        self.player = create_user(
+            email="player1@example.com",
+            password="testpassword",
+            imie="Jan",
+            nazwisko="Kowalski",
+            gender="MALE",
+            user_type="PL",
+        )
+        other = create_user(
+            email="player2@example.com",
+            password="testpassword",
+            gender="MALE",
+            user_type="PL",
+        )
+        for month, rows in [
+            (3, [(other.id, 90), (self.player.id, 80)]),
+            (1, [(self.player.id, 50)]),
+            (2, [(self.player.id, 70), (other.id, 60)]),
+        ]:
+            engine.write_snapshot(
+                "MALE",
+                datetime.date(2024, month, 1),
+                [{"user_id": user_id, "points": p} for user_id, p in rows],
+            )
+
+    def test_player_history(self):
+        """Test returning the player's positions ordered by date."""
+        res = self.client.get(self.url, {"player": self.player.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["full_name"], "Jan Kowalski")
+        self.assertEqual(
+            [
+                (row["date"], row["position"], row["points"])
+                for row in res.data["history"]
+            ],
+            [
+                ("2024-01-01", 1, 50),
+                ("2024-02-01", 1, 70),
+                ("2024-03-01", 2, 80),
+            ],
+        )
+
+    def test_player_history_date_range(self):
+        """Test limiting the history to a date range."""
+        res = self.client.get(
+            self.url,
+            {
+                "player": self.player.id,
+                "from": "2024-02-01",
+                "to": "2024-02-28",
+            },
+        )
+
+        self.assertEqual(len(res.data["history"]), 1)
+        self.assertEqual(res.data["history"][0]["date"], "2024-02-01")
+
+    def test_player_history_query_count(self):
+        """Test the history is read with a constant number of queries."""
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {"player": self.player.id})
+
+    def test_history_of_unknown_player(self):
+        """Test 404 for a player that does not exist."""
+        res = self.client.get(self.url, {"player": 9999})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_history_requires_player(self):
+        """Test the player parameter is required."""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
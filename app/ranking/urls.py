@@ -17,5 +17,22 @@ router.register("ranking", views.RankingViewSet, basename="ranking")
 app_name = "ranking"
 
 urlpatterns = [
+    # Publiczne odczyty obsługiwane asynchronicznie, przed trasą
+    # szczegółów rankingu routera
+    path(
+        "ranking/last-ranking/",
+        views.LastRankingView.as_view(),
+        name="ranking-get-last-ranking",
+    ),
+    path(
+        "ranking/movement/",
+        views.RankingMovementView.as_view(),
+        name="ranking-get-movement",
+    ),
+    path(
+        "ranking/history/",
+        views.RankingHistoryView.as_view(),
+        name="ranking-get-history",
+    ),
     path("", include(router.urls)),
 ]
@@ -2,32 +2,90 @@
 Views for ranking API.
 """
 
-from rest_framework.decorators import action
-from rest_framework import viewsets, status
+import datetime
+
+from rest_framework import serializers, viewsets, status
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.utils import timezone
-from datetime import timedelta
-from core.models import (
-    Ranking,
-    User,
-    PlayerTournamentResult,
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    inline_serializer,
+)
+
+from core.models import Ranking, RankingEntry, User
+from core.views import AsyncAPIView
+from job import queue
+from ranking import cache as ranking_cache
+from ranking import jobs
+from .serializers import (
+    RankingHistorySerializer,
+    RankingMovementSerializer,
+    RankingSerializer,
 )
-from .serializers import RankingSerializer
 
 from django.views.generic import TemplateView
 
+# Domyślna i maksymalna liczba wierszy rankingu w jednej odpowiedzi
+RANKING_PAGE_SIZE = 100
+RANKING_MAX_PAGE_SIZE = 1000
+# Liczba sąsiednich miejsc zwracanych wokół zawodnika
+RANKING_AROUND = 5
+
+# Parametry wyboru fragmentu rankingu, opisane w schemacie API
+SLICE_PARAMETERS = [
+    OpenApiParameter(
+        "gender", str, required=True, enum=["MALE", "FEMALE"]
+    ),
+    OpenApiParameter(
+        "top", int, description="Return the first top positions only."
+    ),
+    OpenApiParameter(
+        "player", int, description="Return the positions around a player."
+    ),
+    OpenApiParameter(
+        "around",
+        int,
+        description="Positions above and below the player "
+        f"(default {RANKING_AROUND}).",
+    ),
+    OpenApiParameter(
+        "limit",
+        int,
+        description=f"Page size (default {RANKING_PAGE_SIZE}, "
+        f"at most {RANKING_MAX_PAGE_SIZE}).",
+    ),
+    OpenApiParameter(
+        "offset", int, description="Number of leading positions to skip."
+    ),
+]
+ERROR_RESPONSES = {
+    400: OpenApiResponse(description="Invalid query parameter."),
+    404: OpenApiResponse(description="No ranking or player found."),
+}
+
 
 class RankingViewSet(viewsets.ModelViewSet):
     """View for manage ranking APIs."""
 
-    queryset = Ranking.objects.all()
+    queryset = Ranking.objects.prefetch_related(
+        Prefetch(
+            "entries", queryset=RankingEntry.objects.select_related("player")
+        )
+    )
     serializer_class = RankingSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Retrieve all historical rankings."""
-        queryset = Ranking.objects.all()
+        queryset = self.queryset.all()
 
         # Filtrowanie po dacie, jeśli podano
         date = self.request.query_params.get("date")
@@ -42,97 +100,114 @@ class RankingViewSet(viewsets.ModelViewSet):
         return queryset
 
     def create(self, request, *args, **kwargs):
-        current_date = timezone.now().date()
-        one_year_ago = current_date - timedelta(days=365)
+        """Queue generation of today's snapshots for both genders."""
+        job = queue.enqueue(jobs.CREATE_SNAPSHOTS, user=request.user)
+        return Response(
+            {
+                "job_id": job.id,
+                "status_url": reverse("job:job-detail", args=[job.id]),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-        # Zbieranie zawodników płci męskiej i będących zawodnikami
-        male_players = User.objects.filter(gender="MALE", user_type="PL")
 
-        male_rankings = {}
+class LastRankingView(AsyncAPIView):
+    """Last ranking of a gender, served asynchronously."""
 
-        for player in male_players:
-            # Pobieranie wyników zawodnika w ciągu ostatniego roku
-            results = PlayerTournamentResult.objects.filter(
-                player=player, tournament_date__gte=one_year_ago
-            ).order_by("-tournament_date")[
-                :6
-            ]  # Wybieramy 6 ostatnich turniejów
+    @extend_schema(
+        parameters=SLICE_PARAMETERS,
+        responses={200: RankingSerializer, **ERROR_RESPONSES},
+    )
+    async def get(self, request):
+        gender = request.query_params.get("gender")
 
-            # Sumowanie punktów
-            total_points = sum(result.points_awarded for result in results)
+        if gender not in ["MALE", "FEMALE"]:
+            return Response(
+                {"error": "Invalid gender parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            # Sprawdzanie miejsca w rankingu
-            male_rankings[player.id] = total_points
+        cached = await ranking_cache.aget_response(gender, request)
+        if cached is None:
+            snapshot, response = await self.render_last_ranking(
+                request, gender
+            )
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cached = await ranking_cache.aset_response(
+                gender, request, snapshot, response.data
+            )
 
-        # Sortowanie zawodników na podstawie punktów
-        sorted_male_rankings = sorted(
-            male_rankings.items(), key=lambda x: x[1], reverse=True
+        # Warunkowy GET obsługujemy bez zapytań do bazy danych
+        response = get_conditional_response(
+            request,
+            etag=cached["etag"],
+            last_modified=cached["last_modified"],
+        ) or Response(cached["data"], status=status.HTTP_200_OK)
+        response["ETag"] = cached["etag"]
+        response["Last-Modified"] = http_date(cached["last_modified"])
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    async def render_last_ranking(self, request, gender):
+        """Return the last snapshot of a gender and its response."""
+        # Pobieranie ostatniego rekordu dla danej płci
+        last_ranking = (
+            await Ranking.objects.filter(gender=gender)
+            .order_by("-date")
+            .afirst()
         )
 
-        # Tworzenie ostatecznego słownika rankingowego
-        final_male_rankings = {
-            position
-            + 1: {
-                "full_name": f"{User.objects.get(id=player_id).imie} {User.objects.get(id=player_id).nazwisko}",
-                "points": points,
-            }
-            for position, (player_id, points) in enumerate(
-                sorted_male_rankings
+        if not last_ranking:
+            return last_ranking, Response(
+                {"error": "No rankings found"},
+                status=status.HTTP_404_NOT_FOUND,
             )
-        }
-
-        female_players = User.objects.filter(gender="FEMALE", user_type="PL")
-
-        female_rankings = {}
-
-        for player in female_players:
-            # Pobieranie wyników zawodnika w ciągu ostatniego roku
-            results = PlayerTournamentResult.objects.filter(
-                player=player, tournament_date__gte=one_year_ago
-            ).order_by("-tournament_date")[
-                :6
-            ]  # Wybieramy 6 ostatnich turniejów
-
-            # Sumowanie punktów
-            total_points = sum(result.points_awarded for result in results)
-
-            # Sprawdzanie miejsca w rankingu
-            female_rankings[player.id] = total_points
-
-        # Sortowanie zawodników na podstawie punktów
-        sorted_female_rankings = sorted(
-            female_rankings.items(), key=lambda x: x[1], reverse=True
-        )
 
-        # Tworzenie ostatecznego słownika rankingowego
-        final_female_rankings = {
-            position + 1: {"user_id": player_id, "points": points}
-            for position, (player_id, points) in enumerate(
-                sorted_female_rankings
+        try:
+            entries, links = await slice_entries(request, last_ranking)
+        except ValueError as error:
+            return last_ranking, Response(
+                {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if entries is None:
+            return last_ranking, Response(
+                {"error": "Player not found in ranking"},
+                status=status.HTTP_404_NOT_FOUND,
             )
-        }
 
-        # Zapisanie rankingu do bazy danych
-        Ranking.objects.update_or_create(
-            date=current_date,
-            gender="MALE",
-            defaults={"rankings": final_male_rankings},
+        # Serializacja wybranego fragmentu ostatniego rankingu
+        serializer = RankingSerializer(
+            last_ranking, context={"entries": entries}
         )
 
-        Ranking.objects.update_or_create(
-            date=current_date,
-            gender="FEMALE",
-            defaults={"rankings": final_female_rankings},
+        return last_ranking, Response(
+            {**serializer.data, **links}, status=status.HTTP_200_OK
         )
-        return Response(status=status.HTTP_201_CREATED)
 
-    @action(
-        detail=False,
-        methods=["get"],
-        url_path="last-ranking",
-        permission_classes=[AllowAny],
+
+class RankingMovementView(AsyncAPIView):
+    """Last ranking compared with an earlier one, served asynchronously."""
+
+    @extend_schema(
+        parameters=[
+            *SLICE_PARAMETERS,
+            OpenApiParameter(
+                "since",
+                OpenApiTypes.DATE,
+                description="Compare with the last ranking on or before "
+                "this date instead of the previous one.",
+            ),
+        ],
+        responses={200: RankingMovementSerializer, **ERROR_RESPONSES},
     )
-    def get_last_ranking(self, request):
+    async def get(self, request):
+        """Compare the last ranking with an earlier one.
+
+        The earlier snapshot is the last one on or before "since", or the
+        previous snapshot when no date is given. Paging parameters are the
+        same as for the last ranking.
+        """
         gender = request.query_params.get("gender")
 
         if gender not in ["MALE", "FEMALE"]:
@@ -141,21 +216,218 @@ class RankingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Pobieranie ostatniego rekordu dla danej płci
-        last_ranking = (
-            Ranking.objects.filter(gender=gender).order_by("-date").first()
+        snapshots = Ranking.objects.filter(gender=gender).order_by("-date")
+        current = await snapshots.afirst()
+        if not current:
+            return Response(
+                {"error": "No rankings found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        earlier = snapshots.exclude(pk=current.pk)
+        try:
+            since = query_date(request.query_params, "since")
+        except ValueError as error:
+            return Response(
+                {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if since:
+            earlier = earlier.filter(date__lte=since)
+        previous = await earlier.afirst()
+        if not previous:
+            return Response(
+                {"error": "No earlier ranking found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        data = await ranking_cache.aget_movement(current, previous, request)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
+        try:
+            entries, links = await slice_entries(request, current, previous)
+        except ValueError as error:
+            return Response(
+                {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if entries is None:
+            return Response(
+                {"error": "Player not found in ranking"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = RankingMovementSerializer(
+            current, context={"entries": entries, "previous": previous}
         )
+        data = {**serializer.data, **links}
+        await ranking_cache.aset_movement(current, previous, request, data)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class RankingHistoryView(AsyncAPIView):
+    """A player's ranking history, served asynchronously."""
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("player", int, required=True),
+            OpenApiParameter("from", OpenApiTypes.DATE),
+            OpenApiParameter("to", OpenApiTypes.DATE),
+        ],
+        responses={
+            200: inline_serializer(
+                "RankingHistoryResponse",
+                {
+                    "user_id": serializers.IntegerField(),
+                    "full_name": serializers.CharField(),
+                    "history": RankingHistorySerializer(many=True),
+                },
+            ),
+            **ERROR_RESPONSES,
+        },
+    )
+    async def get(self, request):
+        """Return a player's position in every snapshot, oldest first.
+
+        The series can be limited with "from" and "to" dates.
+        """
+        try:
+            player_id = query_int(request.query_params, "player")
+            date_from, date_to = (
+                query_date(request.query_params, name)
+                for name in ("from", "to")
+            )
+        except ValueError as error:
+            return Response(
+                {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        if not last_ranking:
+        player = (
+            await User.objects.filter(
+                id=player_id, user_type=User.UserType.PLAYER
+            )
+            .values("id", "imie", "nazwisko")
+            .afirst()
+        )
+        if not player:
             return Response(
-                {"error": "No rankings found"},
+                {"error": "Player not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Serializacja ostatniego rankingu
-        serializer = RankingSerializer(last_ranking)
+        entries = (
+            RankingEntry.objects.filter(player_id=player_id)
+            .select_related("snapshot")
+            .only("position", "points", "snapshot__date")
+            .order_by("snapshot__date")
+        )
+        if date_from:
+            entries = entries.filter(snapshot__date__gte=date_from)
+        if date_to:
+            entries = entries.filter(snapshot__date__lte=date_to)
+        entries = [entry async for entry in entries]
+
+        return Response(
+            {
+                "user_id": player["id"],
+                "full_name": f"{player['imie']} {player['nazwisko']}",
+                "history": RankingHistorySerializer(entries, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+async def slice_entries(request, snapshot, previous=None):
+    """Return the requested entries of a snapshot and paging links.
+
+    Supports "top", "player" (with "around") and "limit"/"offset",
+    where offset is the number of leading positions to skip. With a
+    previous snapshot, entries are annotated with their earlier position
+    and points. The entries are fetched, so they can be serialized
+    without touching the database.
+    """
+    params = request.query_params
+    entries = snapshot.entries.select_related("player")
+    links = {"count": await snapshot.entries.acount()}
+
+    if "player" in params:
+        player_id = query_int(params, "player")
+        around = query_int(params, "around", RANKING_AROUND)
+        entry = await snapshot.entries.filter(player_id=player_id).afirst()
+        if entry is None:
+            return None, links
+        entries = entries.filter(
+            position__gte=entry.position - around,
+            position__lte=entry.position + around,
+        )
+    elif "top" in params:
+        top = min(query_int(params, "top"), RANKING_MAX_PAGE_SIZE)
+        entries = entries.filter(position__lte=top)
+    else:
+        limit = min(
+            query_int(params, "limit", RANKING_PAGE_SIZE, minimum=1),
+            RANKING_MAX_PAGE_SIZE,
+        )
+        offset = query_int(params, "offset", 0)
+        url = ranking_cache.canonical_url(request)
+        links["next"] = (
+            replace_query_param(
+                replace_query_param(url, "limit", limit),
+                "offset",
+                offset + limit,
+            )
+            if offset + limit < links["count"]
+            else None
+        )
+        links["previous"] = (
+            replace_query_param(
+                replace_query_param(url, "limit", limit),
+                "offset",
+                max(offset - limit, 0),
+            )
+            if offset > 0
+            else None
+        )
+        entries = entries.filter(
+            position__gt=offset, position__lte=offset + limit
+        )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    if previous is not None:
+        # Pozycja zawodnika we wcześniejszym rankingu z indeksu
+        # (snapshot, player), w tym samym zapytaniu co bieżąca strona
+        previous_entry = RankingEntry.objects.filter(
+            snapshot=previous, player=OuterRef("player")
+        )
+        entries = entries.annotate(
+            previous_position=Subquery(previous_entry.values("position")[:1]),
+            previous_points=Subquery(previous_entry.values("points")[:1]),
+        )
+    return [entry async for entry in entries], links
+
+
+def query_int(params, name, default=None, minimum=0):
+    """Return an integer query parameter of at least minimum."""
+    value = params.get(name)
+    if value is None and default is not None:
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = -1
+    if value < minimum:
+        raise ValueError(f"Invalid {name} parameter")
+    return value
+
+
+def query_date(params, name):
+    """Return an optional YYYY-MM-DD date query parameter."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} parameter")
 
 
 class RankingTemplateViewSet(TemplateView):
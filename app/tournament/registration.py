@@ -0,0 +1,157 @@
+"""
+Bulk registration of teams in a tournament.
+"""
+
+import csv
+import io
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import Team, User
+
+# Maksymalna liczba par w jednym zgłoszeniu
+MAX_PAIRS = 200
+
+
+def parse_csv(file):
+    """Return the rows of an uploaded CSV file of player pairs.
+
+    Cells are player IDs or e-mails, separated by commas or semicolons.
+    A header row and blank rows are skipped. Raises ValueError when the
+    file is not UTF-8 encoded.
+    """
+    try:
+        text = file.read().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError(
+            "The file must be UTF-8 encoded, save it as CSV UTF-8."
+        )
+    try:
+        dialect = csv.Sniffer().sniff(text[:1024], delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    rows = [
+        [cell.strip() for cell in row if cell.strip()]
+        for row in csv.reader(io.StringIO(text), dialect)
+    ]
+    rows = [row for row in rows if row]
+    if rows and not any(cell.isdigit() or "@" in cell for cell in rows[0]):
+        rows = rows[1:]
+    return rows
+
+
+def _normalize(cell):
+    """Return a player reference as an int ID or a normalized e-mail."""
+    cell = str(cell).strip()
+    if cell.isdigit():
+        return int(cell)
+    return BaseUserManager.normalize_email(cell)
+
+
+def _load_players(references):
+    """Return players by ID and by e-mail, fetched with one query."""
+    ids = {ref for ref in references if isinstance(ref, int)}
+    emails = {ref for ref in references if isinstance(ref, str)}
+    players = User.objects.filter(id__in=ids) | User.objects.filter(
+        email__in=emails
+    )
+    by_ref = {}
+    for player in players.only(
+        "id", "email", "imie", "nazwisko", "user_type", "gender"
+    ):
+        by_ref[player.id] = player
+        by_ref[player.email] = player
+    return by_ref
+
+
+def validate_pairs(tournament, rows):
+    """Resolve and validate rows of player references.
+
+    Return the list of player pairs and a list of per-row errors; the
+    pairs are only meaningful when there are no errors.
+    """
+    rows = [[_normalize(cell) for cell in row] for row in rows]
+    players = _load_players({ref for row in rows for ref in row})
+    # Zawodnicy już zgłoszeni w tym turnieju
+    registered = {
+        player_id
+        for player_ids in tournament.teams.values_list("player_ids", flat=True)
+        for player_id in player_ids
+    }
+
+    pairs = []
+    errors = []
+    seen = {}
+    for number, row in enumerate(rows, start=1):
+        row_errors = []
+        if len(row) != 2:
+            row_errors.append("A team must have exactly 2 players.")
+        pair = []
+        for ref in row:
+            player = players.get(ref)
+            if player is None:
+                row_errors.append(f"Player {ref} does not exist.")
+            elif player.user_type != User.UserType.PLAYER:
+                row_errors.append(f"{ref} is not a player.")
+            elif player.gender != tournament.sex:
+                row_errors.append(
+                    f"{ref} does not match the gender of the tournament."
+                )
+            elif player.id in registered:
+                row_errors.append(
+                    f"{ref} is already registered in this tournament."
+                )
+            elif player.id in seen:
+                row_errors.append(
+                    f"{ref} is already listed in row {seen[player.id]}."
+                )
+            else:
+                seen[player.id] = number
+                pair.append(player)
+
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+        else:
+            pairs.append(pair)
+    return pairs, errors
+
+
+@transaction.atomic
+def register_pairs(tournament, pairs):
+    """Add the teams of player pairs to the tournament.
+
+    Existing teams of the pairs are reused and the missing ones created.
+    Each step is a single query, whatever the number of pairs.
+    """
+    keys = [tuple(sorted(player.id for player in pair)) for pair in pairs]
+    lookup = Q()
+    for low, high in keys:
+        lookup |= Q(player_low_id=low, player_high_id=high)
+    existing = {
+        (team.player_low_id, team.player_high_id): team
+        for team in Team.objects.filter(lookup)
+    }
+
+    new_teams = []
+    for key, pair in zip(keys, pairs):
+        if key not in existing:
+            team = Team()
+            team.set_display(pair)
+            existing[key] = team
+            new_teams.append(team)
+    Team.objects.bulk_create(new_teams)
+    Team.players.through.objects.bulk_create(
+        Team.players.through(team_id=team.id, user_id=player_id)
+        for team in new_teams
+        for player_id in team.player_ids
+    )
+
+    teams = [existing[key] for key in keys]
+    # Podwójne zgłoszenie drużyny odrzuca ograniczenie unikalności
+    tournament.teams.through.objects.bulk_create(
+        tournament.teams.through(tournament_id=tournament.id, team_id=team.id)
+        for team in teams
+    )
+    return teams
@@ -8,20 +8,23 @@ from core.models import (
     Tournament,
     Team,
 )
+from core.serializers import TimedSerializerMixin
+from tournament import registration
 
 
-class TeamSerializer(serializers.ModelSerializer):
-    string = serializers.SerializerMethodField()
+class TeamSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    # Dane zawodników zapisane w drużynie, bez dodatkowych zapytań
+    players = serializers.ListField(source="player_ids", read_only=True)
+    string = serializers.CharField(source="__str__", read_only=True)
 
     class Meta:
         model = Team
         fields = ["id", "players", "string"]
 
-    def get_string(self, obj):
-        return str(obj)
 
-
-class TournamentSerializer(serializers.ModelSerializer):
+class TournamentSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
     """Serializer for Tournaments."""
 
     sex_display = serializers.SerializerMethodField()
@@ -58,6 +61,67 @@ class TournamentSerializer(serializers.ModelSerializer):
         return obj.get_ranking_type_display()
 
 
+def query_list(request, name):
+    """Return the comma-separated values of a query parameter as a set."""
+    value = request.query_params.get(name, "")
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+class SparseFieldsMixin:
+    """Serializer mixin honouring the ?fields= and ?expand= parameters.
+
+    Nested data listed in expandable_fields is serialized only when asked
+    for with ?expand=, and ?fields= keeps only the listed fields.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+
+        expand = query_list(request, "expand")
+        for name, make_field in self.expandable_fields.items():
+            if name in expand:
+                self.fields[name] = make_field()
+
+        requested = query_list(request, "fields")
+        if requested:
+            for name in set(self.fields) - requested - expand:
+                self.fields.pop(name)
+
+
+class TournamentSummarySerializer(
+    TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer
+):
+    """Compact serializer for lists of tournaments."""
+
+    sex_display = serializers.CharField(source="get_sex_display")
+    team_count = serializers.IntegerField(read_only=True)
+
+    expandable_fields = {
+        "teams": lambda: TeamSerializer(many=True, read_only=True),
+    }
+
+    class Meta:
+        model = Tournament
+        fields = [
+            "id",
+            "name",
+            "tour_type",
+            "city",
+            "sex",
+            "sex_display",
+            "ranking_type",
+            "date_of_beginning",
+            "date_of_finishing",
+            "team_count",
+        ]
+        read_only_fields = fields
+
+
 class TournamentDetailSerializer(TournamentSerializer):
     """Serializer of manager of Tournament API."""
 
@@ -71,6 +135,17 @@ class TeamCreationSerializer(serializers.Serializer):
     )
 
 
+class BulkTeamRegistrationSerializer(serializers.Serializer):
+    """Serializer for registering many teams at once."""
+
+    pairs = serializers.ListField(
+        child=serializers.ListField(child=serializers.CharField()),
+        allow_empty=False,
+        max_length=registration.MAX_PAIRS,
+        help_text="List of player pairs given by player ID or e-mail.",
+    )
+
+
 class RemoveTeamSerializer(serializers.Serializer):
     team_id = serializers.IntegerField(
         required=True,
@@ -80,15 +155,18 @@ class RemoveTeamSerializer(serializers.Serializer):
 
 class TeamPositionSerializer(serializers.Serializer):
     team_id = serializers.IntegerField()
-    position = serializers.IntegerField()
+    position = serializers.IntegerField(min_value=1)
 
 
 class AwardPointsSerializer(serializers.Serializer):
     """Serializer for awarding points to teams."""
 
-    team_results = serializers.ListField(
-        child=serializers.DictField(
-            child=serializers.IntegerField(required=True), required=True
-        ),
-        required=True,
-    )
+    team_results = TeamPositionSerializer(many=True, allow_empty=False)
+
+    def validate_team_results(self, value):
+        team_ids = [result["team_id"] for result in value]
+        if len(team_ids) != len(set(team_ids)):
+            raise serializers.ValidationError(
+                "Each team can be listed only once."
+            )
+        return value
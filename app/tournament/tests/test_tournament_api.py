@@ -1,7 +1,15 @@
 """Test for tournaments API."""
 
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Count
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from rest_framework import status
@@ -13,7 +21,11 @@ from core.models import (
     PlayerTournamentResult,
 )
 
-from tournament.serializers import TournamentDetailSerializer
+from tournament import views
+from tournament.serializers import (
+    TournamentDetailSerializer,
+    TournamentSummarySerializer,
+)
 
 import datetime
 
@@ -88,12 +100,14 @@ class PublicTournamentAPITests(TestCase):
         create_tournament(user=user1)
         create_tournament(user=user2, **payload)
 
-        res = self.client.get(PUBLIC_TOURNAMENTS_URL)
+        res = self.client.get(PUBLIC_TOURNAMENTS_URL, {"upcoming": "false"})
 
-        tournaments = Tournament.objects.all().order_by("date_of_beginning")
-        serializer = TournamentDetailSerializer(tournaments, many=True)
+        tournaments = Tournament.objects.annotate(
+            team_count=Count("teams")
+        ).order_by("date_of_beginning")
+        serializer = TournamentSummarySerializer(tournaments, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
 
 class PrivateTournamentAPITest(TestCase):
@@ -116,8 +130,10 @@ class PrivateTournamentAPITest(TestCase):
 
         res = self.client.get(TOURNAMENTS_URL)
 
-        tournaments = Tournament.objects.all().order_by("-id")
-        serializer = TournamentDetailSerializer(tournaments, many=True)
+        tournaments = Tournament.objects.annotate(
+            team_count=Count("teams")
+        ).order_by("-id")
+        serializer = TournamentSummarySerializer(tournaments, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
@@ -287,6 +303,28 @@ class TournamentTeamTestCase(TestCase):
             ).exists()
         )
 
+    def test_create_team_player_with_other_partner(self):
+        """Test a player cannot register with a second partner."""
+        player3 = create_user(
+            email="player3@example.com",
+            password="TestPass123",
+            user_type="PL",
+            gender="MALE",
+        )
+        self.client.force_authenticate(self.player1)
+        self.client.post(
+            f"{self.url}create_team/",
+            {"players": [self.player1.id, self.player2.id]},
+        )
+
+        res = self.client.post(
+            f"{self.url}create_team/",
+            {"players": [self.player1.id, player3.id]},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.tournament.teams.count(), 1)
+
 
 class RemoveTeamFromTournamentTests(TestCase):
     """Tests for removing a team from a tournament."""
@@ -433,3 +471,618 @@ class TournamentPointsTests(TestCase):
 
         res = self.client.post(self.url, payload, format="json")
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_award_points_resubmission_is_idempotent(self):
+        """Test submitting the results again overwrites them."""
+        self.client.force_authenticate(self.organizer)
+
+        for position in (1, 1, 2):
+            payload = {
+                "team_results": [
+                    {"team_id": self.team.id, "position": position}
+                ]
+            }
+            res = self.client.post(self.url, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        results = PlayerTournamentResult.objects.all()
+        self.assertEqual(results.count(), 2)
+        self.assertTrue(all(r.points_awarded == 60 for r in results))
+
+    def test_award_points_team_not_in_tournament(self):
+        """Test teams outside the tournament are rejected, nothing saved."""
+        self.client.force_authenticate(self.organizer)
+        other_team = Team.objects.create()
+
+        payload = {
+            "team_results": [
+                {"team_id": self.team.id, "position": 1},
+                {"team_id": other_team.id, "position": 2},
+            ]
+        }
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["team_ids"], [other_team.id])
+        self.assertFalse(PlayerTournamentResult.objects.exists())
+
+    def test_award_points_duplicate_team(self):
+        """Test a team listed twice is rejected."""
+        self.client.force_authenticate(self.organizer)
+
+        payload = {
+            "team_results": [
+                {"team_id": self.team.id, "position": 1},
+                {"team_id": self.team.id, "position": 2},
+            ]
+        }
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PlayerTournamentResult.objects.exists())
+
+    def test_award_points_player_in_two_teams(self):
+        """Test a player in two of the teams is rejected, nothing saved."""
+        self.client.force_authenticate(self.organizer)
+        player3 = create_user(
+            email="player3@example.com", password="123TestPass", user_type="PL"
+        )
+        other_team = Team.objects.create()
+        other_team.players.set([self.player1, player3])
+        self.tournament.teams.add(other_team)
+
+        payload = {
+            "team_results": [
+                {"team_id": self.team.id, "position": 1},
+                {"team_id": other_team.id, "position": 2},
+            ]
+        }
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["player_ids"], [self.player1.id])
+        self.assertFalse(PlayerTournamentResult.objects.exists())
+
+    def test_award_points_query_count_is_constant(self):
+        """Test the number of queries does not grow with the teams."""
+        self.client.force_authenticate(self.organizer)
+
+        def award(teams):
+            payload = {
+                "team_results": [
+                    {"team_id": team.id, "position": position}
+                    for position, team in enumerate(teams, start=1)
+                ]
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(self.url, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        teams = [self.team]
+        for i in range(8):
+            team = Team.objects.create()
+            team.players.set(
+                [
+                    create_user(
+                        email=f"extra{i}{j}@example.com",
+                        password="123TestPass",
+                        user_type="PL",
+                    )
+                    for j in range(2)
+                ]
+            )
+            self.tournament.teams.add(team)
+            teams.append(team)
+
+        self.assertEqual(award(teams[:1]), award(teams))
+
+
+class TeamPairTests(TestCase):
+    """Tests for reusing the team of a player pair."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = create_user(
+            email="organizer@example.com", password="password", user_type="OR"
+        )
+        self.player1 = create_user(
+            email="player1@example.com",
+            password="123TestPass",
+            user_type="PL",
+            gender="MALE",
+        )
+        self.player2 = create_user(
+            email="player2@example.com",
+            password="123TestPass",
+            user_type="PL",
+            gender="MALE",
+        )
+        self.client.force_authenticate(self.player1)
+
+    def register(self, tournament, players):
+        url = reverse(
+            "tournament:tournament-create-team", kwargs={"pk": tournament.id}
+        )
+        return self.client.post(url, {"players": players}, format="json")
+
+    def test_pair_team_is_reused(self):
+        """Test a pair registering again plays as the same team."""
+        first = create_tournament(user=self.organizer, sex="MALE")
+        second = create_tournament(user=self.organizer, sex="MALE")
+
+        res1 = self.register(first, [self.player1.id, self.player2.id])
+        res2 = self.register(second, [self.player2.id, self.player1.id])
+
+        self.assertEqual(res1.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res2.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res1.data["team"]["id"], res2.data["team"]["id"])
+        self.assertEqual(Team.objects.count(), 1)
+
+    def test_duplicate_registration_rejected(self):
+        """Test a pair cannot register twice in the same tournament."""
+        tournament = create_tournament(user=self.organizer, sex="MALE")
+        self.register(tournament, [self.player1.id, self.player2.id])
+
+        res = self.register(tournament, [self.player1.id, self.player2.id])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(tournament.teams.count(), 1)
+
+    def test_bulk_registration_reuses_pair_team(self):
+        """Test bulk registration reuses the team of a known pair."""
+        team = Team.objects.get_or_create_pair(
+            self.player1.id, self.player2.id
+        )
+        tournament = create_tournament(user=self.organizer, sex="MALE")
+        self.client.force_authenticate(self.organizer)
+        url = reverse(
+            "tournament:tournament-register-teams",
+            kwargs={"pk": tournament.id},
+        )
+
+        res = self.client.post(
+            url,
+            {"pairs": [[self.player2.id, self.player1.id]]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(tournament.teams.all()), [team])
+        self.assertEqual(Team.objects.count(), 1)
+
+
+class BulkTeamRegistrationTests(TestCase):
+    """Tests for registering many teams at once."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = create_user(
+            email="organizer@example.com", password="password", user_type="OR"
+        )
+        self.tournament = create_tournament(user=self.organizer, sex="MALE")
+        self.players = [
+            create_user(
+                email=f"player{i}@example.com",
+                password="123TestPass",
+                imie="Gracz",
+                nazwisko=str(i),
+                user_type="PL",
+                gender="MALE",
+            )
+            for i in range(6)
+        ]
+        self.url = reverse(
+            "tournament:tournament-register-teams",
+            kwargs={"pk": self.tournament.id},
+        )
+        self.client.force_authenticate(self.organizer)
+
+    def test_register_pairs_from_json(self):
+        """Test pairs given by ID or e-mail become tournament teams."""
+        payload = {
+            "pairs": [
+                [self.players[0].id, self.players[1].id],
+                ["player2@example.com", "player3@example.com"],
+            ]
+        }
+
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.tournament.teams.count(), 2)
+        self.assertEqual(
+            [team["string"] for team in res.data["teams"]],
+            ["Gracz 0 & Gracz 1", "Gracz 2 & Gracz 3"],
+        )
+        team = self.tournament.teams.get(id=res.data["teams"][1]["id"])
+        self.assertEqual(
+            sorted(team.players.values_list("id", flat=True)),
+            [self.players[2].id, self.players[3].id],
+        )
+
+    def test_register_pairs_from_csv(self):
+        """Test pairs can be uploaded as a CSV file with a header."""
+        content = (
+            "zawodnik1;zawodnik2\n"
+            f"{self.players[0].id};{self.players[1].id}\n"
+            "\n"
+            "player2@example.com;player3@example.com\n"
+        )
+        upload = SimpleUploadedFile(
+            "pairs.csv", content.encode(), content_type="text/csv"
+        )
+
+        res = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.tournament.teams.count(), 2)
+
+    def test_register_pairs_from_non_utf8_csv(self):
+        """Test a CSV file in another encoding is rejected with a 400."""
+        content = "Zawodnik;Zawodniczka żółć\n1;2\n"
+        upload = SimpleUploadedFile(
+            "pairs.csv", content.encode("cp1250"), content_type="text/csv"
+        )
+
+        res = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("UTF-8", res.data["detail"])
+        self.assertFalse(self.tournament.teams.exists())
+
+    def test_invalid_rows_are_reported(self):
+        """Test invalid rows are reported and nothing is registered."""
+        woman = create_user(
+            email="woman@example.com",
+            password="123TestPass",
+            user_type="PL",
+            gender="FEMALE",
+        )
+        payload = {
+            "pairs": [
+                [self.players[0].id, self.players[1].id],
+                [self.players[2].id, woman.id],
+                [self.players[3].id, self.organizer.id],
+                [self.players[1].id, self.players[4].id],
+                [self.players[5].id],
+                [self.players[5].id, 999999],
+            ]
+        }
+
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [error["row"] for error in res.data["errors"]], [2, 3, 4, 5, 6]
+        )
+        self.assertFalse(self.tournament.teams.exists())
+
+    def test_already_registered_player(self):
+        """Test players already in the tournament cannot be registered."""
+        team = Team.objects.create()
+        team.players.set(self.players[:2])
+        self.tournament.teams.add(team)
+
+        payload = {"pairs": [[self.players[1].id, self.players[2].id]]}
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["errors"][0]["row"], 1)
+
+    def test_only_organizers_can_register(self):
+        """Test players cannot register teams in bulk."""
+        self.client.force_authenticate(self.players[0])
+
+        payload = {"pairs": [[self.players[0].id, self.players[1].id]]}
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_query_count_is_constant(self):
+        """Test the number of queries does not grow with the pairs."""
+
+        def register(pairs):
+            tournament = create_tournament(user=self.organizer, sex="MALE")
+            url = reverse(
+                "tournament:tournament-register-teams",
+                kwargs={"pk": tournament.id},
+            )
+            payload = {
+                "pairs": [[first.id, second.id] for first, second in pairs]
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(url, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        pairs = list(zip(self.players[::2], self.players[1::2]))
+        self.assertEqual(register(pairs[:1]), register(pairs))
+
+
+class TournamentListQueryBudgetTests(TestCase):
+    """Tests for the number of queries of tournament list endpoints."""
+
+    # Lista skrócona: turnieje z liczbą drużyn w jednym zapytaniu
+    LIST_QUERY_BUDGET = 1
+    # Turnieje i drużyny - po jednym zapytaniu
+    EXPANDED_QUERY_BUDGET = 2
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = create_user(
+            email="organizer@example.com",
+            password="testpass123",
+            user_type="OR",
+        )
+        players = [
+            create_user(
+                email=f"player{i}@example.com",
+                password="testpass123",
+                imie="Gracz",
+                nazwisko=str(i),
+                user_type="PL",
+                gender="MALE",
+            )
+            for i in range(4)
+        ]
+        for i in range(3):
+            tournament = create_tournament(
+                user=self.organizer, name=f"Cup {i}", sex="MALE"
+            )
+            for first, second in [(0, 1), (2, 3)]:
+                tournament.teams.add(
+                    Team.objects.get_or_create_pair(
+                        players[first].id, players[second].id
+                    )
+                )
+
+    def test_public_list_query_budget(self):
+        """Test the public list needs a fixed number of queries."""
+        with self.assertNumQueries(self.LIST_QUERY_BUDGET):
+            res = self.client.get(
+                PUBLIC_TOURNAMENTS_URL, {"upcoming": "false"}
+            )
+
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertEqual(res.data["results"][0]["team_count"], 2)
+        self.assertNotIn("teams", res.data["results"][0])
+
+    def test_expanded_public_list_query_budget(self):
+        """Test expanding teams needs a fixed number of queries."""
+        with self.assertNumQueries(self.EXPANDED_QUERY_BUDGET):
+            res = self.client.get(
+                PUBLIC_TOURNAMENTS_URL,
+                {"upcoming": "false", "expand": "teams"},
+            )
+
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertEqual(
+            res.data["results"][0]["teams"][0]["string"], "Gracz 0 & Gracz 1"
+        )
+
+    def test_organizer_list_query_budget(self):
+        """Test the organizer's list needs a fixed number of queries."""
+        self.client.force_authenticate(self.organizer)
+
+        with self.assertNumQueries(self.LIST_QUERY_BUDGET):
+            res = self.client.get(TOURNAMENTS_URL)
+
+        self.assertEqual(len(res.data), 3)
+
+    def test_player_list_counts_all_teams(self):
+        """Test team_count is not limited to the player's own team."""
+        player = Team.objects.first().players.first()
+        self.client.force_authenticate(player)
+
+        res = self.client.get(TOURNAMENTS_URL)
+
+        self.assertEqual(len(res.data), 3)
+        self.assertTrue(all(row["team_count"] == 2 for row in res.data))
+
+    def test_sparse_fieldset(self):
+        """Test ?fields= keeps only the requested fields."""
+        res = self.client.get(
+            PUBLIC_TOURNAMENTS_URL,
+            {"upcoming": "false", "fields": "id,name,team_count"},
+        )
+
+        self.assertEqual(
+            set(res.data["results"][0]), {"id", "name", "team_count"}
+        )
+
+    def test_sparse_fieldset_with_expand(self):
+        """Test expanded fields are kept next to the requested fields."""
+        res = self.client.get(
+            PUBLIC_TOURNAMENTS_URL,
+            {"upcoming": "false", "fields": "id", "expand": "teams"},
+        )
+
+        self.assertEqual(set(res.data["results"][0]), {"id", "teams"})
+
+
+class TournamentCalendarTests(TestCase):
+    """Tests for filtering and paging the public tournament calendar."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = create_user(
+            email="organizer@example.com",
+            password="testpass123",
+            user_type="OR",
+        )
+        self.today = timezone.now().date()
+
+    def create_on(self, days, length=2, **params):
+        """Create a tournament starting the given number of days from today."""
+        start = self.today + datetime.timedelta(days=days)
+        return create_tournament(
+            user=self.organizer,
+            date_of_beginning=start,
+            date_of_finishing=start + datetime.timedelta(days=length),
+            **params,
+        )
+
+    def get_ids(self, **params):
+        res = self.client.get(PUBLIC_TOURNAMENTS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [tournament["id"] for tournament in res.data["results"]]
+
+    def test_upcoming_only_by_default(self):
+        """Test finished tournaments are hidden unless asked for."""
+        finished = self.create_on(-30)
+        ongoing = self.create_on(-1)
+        upcoming = self.create_on(10)
+
+        self.assertEqual(self.get_ids(), [ongoing.id, upcoming.id])
+        self.assertEqual(
+            self.get_ids(upcoming="false"),
+            [finished.id, ongoing.id, upcoming.id],
+        )
+
+    def test_filter_by_date_range(self):
+        """Test a date range replaces the upcoming default."""
+        self.create_on(-100)
+        inside = self.create_on(-40)
+        self.create_on(10)
+
+        ids = self.get_ids(
+            **{
+                "from": str(self.today - datetime.timedelta(days=50)),
+                "to": str(self.today - datetime.timedelta(days=30)),
+            }
+        )
+
+        self.assertEqual(ids, [inside.id])
+
+    def test_filter_by_attributes(self):
+        """Test filtering by city, sex, tour type and ranking type."""
+        match = self.create_on(
+            5,
+            city="Iława",
+            sex="MALE",
+            tour_type="JR",
+            ranking_type="OneStar",
+        )
+        self.create_on(5, city="Gdańsk", sex="MALE", tour_type="JR")
+        self.create_on(5, city="Iława", sex="FEMALE", tour_type="JR")
+        self.create_on(5, city="Iława", sex="MALE", tour_type="SR")
+
+        ids = self.get_ids(
+            city="iława", sex="MALE", tour_type="JR", ranking_type="OneStar"
+        )
+
+        self.assertEqual(ids, [match.id])
+
+    def test_cursor_paging(self):
+        """Test pages follow (date_of_beginning, id) without overlaps."""
+        tournaments = [self.create_on(days) for days in (3, 1, 2, 2, 5)]
+        expected = [
+            t.id
+            for t in sorted(
+                tournaments, key=lambda t: (t.date_of_beginning, t.id)
+            )
+        ]
+
+        ids = []
+        url = PUBLIC_TOURNAMENTS_URL + "?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertLessEqual(len(res.data["results"]), 2)
+            ids.extend(tournament["id"] for tournament in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(ids, expected)
+
+    def test_cursor_paging_backwards(self):
+        """Test previous links walk back over tournaments of one date."""
+        tournaments = [self.create_on(days) for days in (2, 2, 2, 2, 1)]
+        expected = [
+            t.id
+            for t in sorted(
+                tournaments, key=lambda t: (t.date_of_beginning, t.id)
+            )
+        ]
+        url = PUBLIC_TOURNAMENTS_URL + "?page_size=2"
+        while True:
+            res = self.client.get(url)
+            if not res.data["next"]:
+                break
+            url = res.data["next"]
+
+        ids = []
+        while url:
+            res = self.client.get(url)
+            ids[:0] = [tournament["id"] for tournament in res.data["results"]]
+            url = res.data["previous"]
+
+        self.assertEqual(ids, expected)
+
+    def test_cursor_page_is_one_query(self):
+        """Test a page after a cursor is read with a single query."""
+        for days in (1, 1, 1):
+            self.create_on(days)
+        res = self.client.get(PUBLIC_TOURNAMENTS_URL + "?page_size=1")
+
+        with self.assertNumQueries(1):
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_invalid_cursor_returns_404(self):
+        """Test a malformed cursor is rejected."""
+        res = self.client.get(PUBLIC_TOURNAMENTS_URL, {"cursor": "cD14"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_date_returns_400(self):
+        """Test malformed dates are rejected."""
+        res = self.client.get(PUBLIC_TOURNAMENTS_URL, {"from": "yesterday"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_of_finished_tournament(self):
+        """Test the upcoming default does not hide tournament details."""
+        finished = self.create_on(-30)
+
+        res = self.client.get(
+            reverse("tournament:public-tournament-detail", args=[finished.id])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_public_views_are_async(self):
+        """Test the public reads do not hold a worker thread under ASGI."""
+        self.assertTrue(views.PublicTournamentListView.view_is_async)
+        self.assertTrue(views.PublicTournamentDetailView.view_is_async)
+
+    async def test_concurrent_readers(self):
+        """Test concurrent readers are served by the async views."""
+        tournament = await sync_to_async(self.create_on)(10)
+
+        responses = await asyncio.gather(
+            *(self.async_client.get(PUBLIC_TOURNAMENTS_URL) for _ in range(5)),
+            self.async_client.get(
+                reverse(
+                    "tournament:public-tournament-detail",
+                    args=[tournament.id],
+                )
+            ),
+        )
+
+        for res in responses[:-1]:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [row["id"] for row in res.json()["results"]], [tournament.id]
+            )
+        self.assertEqual(responses[-1].json()["name"], tournament.name)
+
+    async def test_detail_not_found(self):
+        """Test a missing tournament gives 404 with a detail message."""
+        res = await self.async_client.get(
+            reverse("tournament:public-tournament-detail", args=[9999])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn("detail", res.json())
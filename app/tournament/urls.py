@@ -12,11 +12,15 @@ from tournament import views
 
 router = DefaultRouter()
 router.register('tournament', views.TournamentViewSet, basename='tournament')
-router.register('public-tournaments', views.PublicViewOfTournamentsViewSet,
-                basename='public-tournament')
 
 app_name = 'tournament'
 
 urlpatterns = [
+    # Publiczne odczyty obsługiwane asynchronicznie
+    path('public-tournaments/', views.PublicTournamentListView.as_view(),
+         name='public-tournament-list'),
+    path('public-tournaments/<int:pk>/',
+         views.PublicTournamentDetailView.as_view(),
+         name='public-tournament-detail'),
     path('', include(router.urls)),
 ]
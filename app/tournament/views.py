@@ -2,14 +2,14 @@
 Views for the tournament APIs.
 """
 
+import datetime
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, ParseError, PermissionDenied
+from rest_framework.pagination import Cursor, CursorPagination
 from rest_framework.response import Response
-from rest_framework.permissions import (
-    IsAuthenticated,
-    AllowAny,
-)
+from rest_framework.permissions import IsAuthenticated
 
 from core.models import (
     Tournament,
@@ -18,44 +18,212 @@ from core.models import (
     PlayerTournamentResult,
 )
 
-from tournament import serializers
+from core.views import AsyncAPIView
+from ranking import engine
+from tournament import registration, serializers
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Field, Func, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.shortcuts import aget_object_or_404
+from django.utils import timezone
 
 from django.views.generic import TemplateView
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+
+# Liczba drużyn turnieju liczona podzapytaniem, niezależnie od filtrów
+TEAM_COUNT = Coalesce(
+    Subquery(
+        Tournament.teams.through.objects.filter(tournament=OuterRef("pk"))
+        .values("tournament")
+        .annotate(count=Count("*"))
+        .values("count")
+    ),
+    0,
+)
+
+# Wartości parametru upcoming wyłączające domyślny filtr
+FALSE_VALUES = ("0", "false", "no")
+
+
+class Row(Func):
+    """Row value, compared with another one column by column."""
+
+    function = ""
+    output_field = Field()
+
+
+class TournamentCalendarPagination(CursorPagination):
+    """Keyset pagination of the tournament calendar.
+
+    The cursor holds the (date_of_beginning, id) of the first or last
+    tournament of a page, and the next page starts right after it with
+    a row comparison served by tournament_calendar_idx. The key is
+    unique, so no offsets are needed.
+    """
+
+    ordering = ("date_of_beginning", "id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor and self.cursor.position
+
+        if position:
+            key = self.decode_position(position)
+            lookup = "calendar_key__lt" if reverse else "calendar_key__gt"
+            queryset = queryset.alias(
+                calendar_key=Row("date_of_beginning", "id")
+            ).filter(**{lookup: Row(*map(Value, key))})
+        if reverse:
+            queryset = queryset.order_by("-date_of_beginning", "-id")
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        # Jeden dodatkowy wiersz mówi, czy jest kolejna strona
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+        # Za kursorem jest strona, z której przyszedł klient
+        after, before = has_more, bool(position)
+        if reverse:
+            after, before = before, after
+        self.has_next = bool(self.page) and after
+        self.has_previous = bool(self.page) and before
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(
+            self.page[-1], self.ordering
+        )
+        return self.encode_cursor(Cursor(0, False, position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(
+            self.page[0], self.ordering
+        )
+        return self.encode_cursor(Cursor(0, True, position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        return f"{instance.date_of_beginning.isoformat()}_{instance.pk}"
+
+    def decode_position(self, position):
+        """Return the (date_of_beginning, id) key of a cursor position."""
+        try:
+            date, pk = position.split("_")
+            return datetime.date.fromisoformat(date), int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+
+def summary_queryset(queryset, request):
+    """Prepare a tournament queryset for the summary serializer.
+
+    Teams are counted in the database and fetched only when the client
+    asks for them with ?expand=teams.
+    """
+    queryset = queryset.prefetch_related(None).annotate(team_count=TEAM_COUNT)
+    if "teams" in serializers.query_list(request, "expand"):
+        queryset = queryset.prefetch_related("teams")
+    return queryset
+
+
+def query_date(params, name):
+    """Return a date query parameter, or None when it is missing."""
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ParseError(f"Invalid {name} parameter.")
+
+
+def filter_calendar(queryset, params):
+    """Filter the calendar by the query parameters.
+
+    Without a date range only upcoming tournaments are listed, unless
+    upcoming=false is passed.
+    """
+    date_from = query_date(params, "from")
+    date_to = query_date(params, "to")
+
+    if date_from:
+        queryset = queryset.filter(date_of_finishing__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date_of_beginning__lte=date_to)
+
+    upcoming = params.get("upcoming")
+    if upcoming is None:
+        upcoming = date_from is None and date_to is None
+    else:
+        upcoming = upcoming.lower() not in FALSE_VALUES
+    if upcoming:
+        queryset = queryset.filter(
+            date_of_finishing__gte=timezone.now().date()
+        )
+
+    if params.get("city"):
+        queryset = queryset.filter(city__iexact=params["city"])
+    for field in ("sex", "tour_type", "ranking_type"):
+        if params.get(field):
+            queryset = queryset.filter(**{field: params[field]})
+    return queryset
 
 
 class TournamentViewSet(viewsets.ModelViewSet):
     """View for manage tournament APIs."""
 
     serializer_class = serializers.TournamentDetailSerializer
-    queryset = Tournament.objects.all()
+    queryset = Tournament.objects.prefetch_related("teams")
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Retrieve tournaments for authenticated users."""
         user = self.request.user
+        queryset = self.queryset
+        if self.action == "list":
+            queryset = summary_queryset(queryset, self.request)
 
         # If the user is an organizer, they only see their own tournaments
         if user.user_type == "OR":
-            return self.queryset.filter(user=user).order_by("-id")
+            return queryset.filter(user=user).order_by("-id")
 
         # If the user is a player, they see tournaments in which their team participates
         elif user.user_type == "PL":
             # Check if the action is 'create_team'
             if self.action == "create_team":
                 # Return all tournaments
-                return self.queryset.all()
+                return queryset.all()
             else:
                 # Return only tournaments in which their team participates
-                return self.queryset.filter(teams__players=user).distinct()
+                return queryset.filter(teams__players=user).distinct()
             # Other users (e.g., referees, volunteers) may have additional rights in the future
         return Tournament.objects.none()
 
     def get_serializer_class(self):
         """Serializer for list of tournaments."""
         if self.action == "list":
-            self.serializer_class = serializers.TournamentSerializer
+            return serializers.TournamentSummarySerializer
         elif self.action == "create_team":
             return serializers.TeamCreationSerializer
+        elif self.action == "register_teams":
+            return serializers.BulkTeamRegistrationSerializer
         return self.serializer_class
 
     def perform_create(self, serializer):
@@ -135,11 +303,35 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            team = Team.objects.create()
-            team.players.set(player_ids)
-            team.save()
+            # Zawodnik może mieć w turnieju tylko jednego partnera
+            if (
+                tournament.teams.filter(players__in=player_ids)
+                .exclude(
+                    player_low_id=min(player_ids),
+                    player_high_id=max(player_ids),
+                )
+                .exists()
+            ):
+                return Response(
+                    {
+                        "detail": "A player is already registered in this "
+                        "tournament with another partner."
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-            tournament.teams.add(team)
+            team = Team.objects.get_or_create_pair(*player_ids)
+            try:
+                # Ponowne zgłoszenie pary odrzuca ograniczenie unikalności
+                with transaction.atomic():
+                    Tournament.teams.through.objects.create(
+                        tournament=tournament, team=team
+                    )
+            except IntegrityError:
+                return Response(
+                    {"detail": "This team is already registered."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
             team_serializer = serializers.TeamSerializer(team)
 
@@ -152,6 +344,55 @@ class TournamentViewSet(viewsets.ModelViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=["post"], url_path="register-teams")
+    def register_teams(self, request, pk=None):
+        """Register many teams in the tournament from a JSON or CSV list."""
+        if request.user.user_type != "OR":
+            raise PermissionDenied("Only organizers can register teams.")
+        tournament = self.get_object()
+
+        if "file" in request.FILES:
+            try:
+                rows = registration.parse_csv(request.FILES["file"])
+            except ValueError as error:
+                raise ParseError(str(error))
+            data = {"pairs": rows}
+        else:
+            data = request.data
+        serializer = serializers.BulkTeamRegistrationSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        pairs, errors = registration.validate_pairs(
+            tournament, serializer.validated_data["pairs"]
+        )
+        # Zgłoszenie jest zapisywane w całości albo wcale
+        if errors:
+            return Response(
+                {
+                    "detail": "No teams were registered, fix the rows below.",
+                    "errors": errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            teams = registration.register_pairs(tournament, pairs)
+        except IntegrityError:
+            return Response(
+                {
+                    "detail": "The tournament changed during registration, "
+                    "please try again."
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(
+            {
+                "detail": f"{len(teams)} teams registered successfully.",
+                "teams": serializers.TeamSerializer(teams, many=True).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
     @action(detail=True, methods=["delete"], url_path="remove_team")
     def remove_team(self, request, pk=None):
         """Remove the team from the tournament if the user is an organizer or part of the team."""
@@ -215,36 +456,80 @@ class TournamentViewSet(viewsets.ModelViewSet):
         tournament = self.get_object()
         # Expected input data format
         serializer = serializers.AwardPointsSerializer(data=request.data)
-        if serializer.is_valid():
-            # Process the data
-            team_results = serializer.validated_data["team_results"]
-
-            for result in team_results:
-                team_id = result["team_id"]
-                position = result["position"]
-                # Logic for awarding points
-                team = Team.objects.get(id=team_id)
-
-                # Example logic for awarding points
-                points_awarded = self.calculate_points(
-                    position
-                )  # Define this method according to your point system
-                for i in team.players.all():
-                    PlayerTournamentResult.objects.create(
-                        player=i,
-                        team=team,
-                        tournament=tournament,
-                        points_awarded=points_awarded,
-                        position=position,
-                        tournament_date=tournament.date_of_finishing,
-                    )
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
 
+        team_results = serializer.validated_data["team_results"]
+        # Drużyny wraz z ID zawodników pobierane jednym zapytaniem
+        teams = tournament.teams.in_bulk(
+            [result["team_id"] for result in team_results]
+        )
+        missing = [
+            result["team_id"]
+            for result in team_results
+            if result["team_id"] not in teams
+        ]
+        if missing:
             return Response(
-                {"detail": "Points awarded successfully."},
-                status=status.HTTP_200_OK,
+                {
+                    "detail": "Teams are not registered in this tournament.",
+                    "team_ids": missing,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # Zawodnik w dwóch drużynach dostałby dwa wyniki w jednym turnieju
+        seen = set()
+        conflicts = set()
+        for result in team_results:
+            for player_id in teams[result["team_id"]].player_ids:
+                if player_id in seen:
+                    conflicts.add(player_id)
+                seen.add(player_id)
+        if conflicts:
+            return Response(
+                {
+                    "detail": "Players are in more than one of the teams.",
+                    "player_ids": sorted(conflicts),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = [
+            PlayerTournamentResult(
+                player_id=player_id,
+                team=teams[result["team_id"]],
+                tournament=tournament,
+                points_awarded=self.calculate_points(result["position"]),
+                position=result["position"],
+                tournament_date=tournament.date_of_finishing,
+            )
+            for result in team_results
+            for player_id in teams[result["team_id"]].player_ids
+        ]
+
+        with transaction.atomic():
+            # Ponowne przesłanie wyników nadpisuje poprzednie zamiast dublować
+            PlayerTournamentResult.objects.bulk_create(
+                results,
+                update_conflicts=True,
+                unique_fields=["player", "tournament"],
+                update_fields=[
+                    "team",
+                    "points_awarded",
+                    "position",
+                    "tournament_date",
+                ],
+            )
+            # Update rolling ranking points of the awarded players only
+            engine.refresh_scores(result.player_id for result in results)
+
+        return Response(
+            {"detail": "Points awarded successfully."},
+            status=status.HTTP_200_OK,
+        )
 
     def calculate_points(self, position):
         """Define your point system based on position."""
@@ -258,16 +543,62 @@ class TournamentViewSet(viewsets.ModelViewSet):
         return 0  # No points for other places
 
 
-class PublicViewOfTournamentsViewSet(viewsets.ReadOnlyModelViewSet):
-    """View for listing tournaments publicly."""
+class PublicTournamentListView(AsyncAPIView):
+    """Public calendar of tournaments, served asynchronously."""
+
+    pagination_class = TournamentCalendarPagination
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("from", OpenApiTypes.DATE),
+            OpenApiParameter("to", OpenApiTypes.DATE),
+            OpenApiParameter(
+                "upcoming",
+                bool,
+                description="Only tournaments not finished yet, by default "
+                "when no dates are given.",
+            ),
+            OpenApiParameter("city", str),
+            OpenApiParameter("sex", str),
+            OpenApiParameter("tour_type", str),
+            OpenApiParameter("ranking_type", str),
+            OpenApiParameter(
+                "fields", str, description="Comma separated fields to return."
+            ),
+            OpenApiParameter(
+                "expand", str, description='"teams" includes the teams.'
+            ),
+        ],
+        responses=serializers.TournamentSummarySerializer(many=True),
+    )
+    async def get(self, request):
+        queryset = filter_calendar(
+            Tournament.objects.all(), request.query_params
+        )
+        queryset = summary_queryset(queryset, request)
+        paginator = self.pagination_class()
+        # Strona kalendarza to jedno zapytanie, wykonane poza pętlą zdarzeń
+        page = await sync_to_async(paginator.paginate_queryset)(
+            queryset, request
+        )
+        serializer = serializers.TournamentSummarySerializer(
+            page, many=True, context={"request": request}
+        )
+        return paginator.get_paginated_response(serializer.data)
+
 
-    serializer_class = serializers.TournamentSerializer
-    queryset = Tournament.objects.all()
-    permission_classes = [AllowAny]  # Allow access to everyone
+class PublicTournamentDetailView(AsyncAPIView):
+    """Public details of a tournament, served asynchronously."""
 
-    def get_queryset(self):
-        """Retrieve tournaments publicly."""
-        return self.queryset.order_by("date_of_beginning")
+    @extend_schema(responses=serializers.TournamentSerializer)
+    async def get(self, request, pk):
+        tournament = await aget_object_or_404(
+            Tournament.objects.prefetch_related("teams"), pk=pk
+        )
+        serializer = serializers.TournamentSerializer(
+            tournament, context={"request": request}
+        )
+        return Response(serializer.data)
 
 
 class TournamentListView(TemplateView):
@@ -6,8 +6,10 @@ from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
 
+from core.serializers import TimedSerializerMixin
 
-class UserSerializers(serializers.ModelSerializer):
+
+class UserSerializers(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializers for the user objects."""
 
     class Meta:
@@ -39,7 +41,7 @@ class UserSerializers(serializers.ModelSerializer):
         return user
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializers for the listing users."""
 
     class Meta:
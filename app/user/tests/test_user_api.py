@@ -2,7 +2,15 @@
 Tests for the user API.
 """
 
-from django.test import TestCase
+import shutil
+import tempfile
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -19,6 +27,7 @@ from user.serializers import (
 CREATE_USER_URL = reverse("user:create")
 ME_URL = reverse("user:me")
 LIST_OF_USERS_URL = reverse("user:player-list")
+PLAYER_SEARCH_URL = reverse("user:player-search")
 
 
 def create_user(**params):
@@ -224,3 +233,212 @@ class PrivateUserAPITests(TestCase):
         self.assertEqual(len(res.data), 2)
         for user in res.data:
             self.assertNotIn(user_organizer.imie, user["imie"])
+
+
+class SessionUserCacheTests(TestCase):
+    """Tests for serving authenticated requests from the cache."""
+
+    def setUp(self):
+        # Cache współdzielony przez procesy, ale poza bazą danych
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        file_cache = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": (
+                        "django.core.cache.backends.filebased.FileBasedCache"
+                    ),
+                    "LOCATION": location,
+                }
+            }
+        )
+        file_cache.enable()
+        self.addCleanup(file_cache.disable)
+        cache.clear()
+        self.user = create_user(
+            imie="Test Name",
+            email="testuser@example.com",
+            password="TestPass",
+            gender="MALE",
+        )
+        self.client = APIClient()
+        self.client.login(email="testuser@example.com", password="TestPass")
+
+    def test_authenticated_request_without_queries(self):
+        """Test a request touching no other data makes no queries."""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], "testuser@example.com")
+
+    def test_user_change_invalidates_cache(self):
+        """Test a saved user is read again by the next request."""
+        self.client.get(ME_URL)
+        self.user.imie = "New Name"
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["imie"], "New Name")
+
+    def test_deactivated_user_is_logged_out(self):
+        """Test a deactivated user loses access immediately."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_session_of_model_backend_migrated(self):
+        """Test sessions logged in before the cached backend stay valid."""
+        session = self.client.session
+        session["_auth_user_backend"] = (
+            "django.contrib.auth.backends.ModelBackend"
+        )
+        session.save()
+
+        migration = import_module("core.migrations.0029_session_backend")
+        migration.rewrite_session_backends(apps, None)
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.session["_auth_user_backend"],
+            "core.backends.CachedModelBackend",
+        )
+
+    def test_failed_login_checks_password_once(self):
+        """Test a wrong password is hashed by a single backend."""
+        with patch(
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher.verify",
+            return_value=False,
+        ) as verify:
+            self.assertIsNone(
+                authenticate(email="testuser@example.com", password="Wrong")
+            )
+
+        verify.assert_called_once()
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            }
+        }
+    )
+    def test_process_local_cache_not_used(self):
+        """Test users are not cached when other processes cannot see it."""
+        self.client.get(ME_URL)
+        # Zmiana, której sygnały nie zobaczą, jak w innym procesie
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PlayerSearchTests(TestCase):
+    """Tests for the typeahead search of players."""
+
+    def setUp(self):
+        self.user = create_user(
+            email="kapitan@example.com",
+            password="TestPass",
+            imie="Adam",
+            nazwisko="Nowak",
+            user_type="PL",
+            gender="MALE",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_player(self, email, imie, nazwisko, gender="MALE"):
+        return create_user(
+            email=email,
+            password="TestPass",
+            imie=imie,
+            nazwisko=nazwisko,
+            user_type="PL",
+            gender=gender,
+        )
+
+    def search(self, **params):
+        res = self.client.get(PLAYER_SEARCH_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [player["nazwisko"] for player in res.data]
+
+    def test_prefix_matches_first(self):
+        """Test players whose name starts with the query come first."""
+        self.create_player("p1@example.com", "Jan", "Kowalski")
+        self.create_player("p2@example.com", "Piotr", "Nowakowski")
+        self.create_player("nowak.p@example.com", "Paweł", "Zieliński")
+
+        self.assertEqual(self.search(q="kow"), ["Kowalski", "Nowakowski"])
+        self.assertEqual(self.search(q="nowak"), ["Nowakowski", "Zieliński"])
+
+    def test_every_word_must_match(self):
+        """Test a query of several words narrows the results."""
+        self.create_player("p1@example.com", "Jan", "Kowalski")
+        self.create_player("p2@example.com", "Jan", "Wiśniewski")
+
+        self.assertEqual(self.search(q="jan kow"), ["Kowalski"])
+
+    def test_short_query_returns_nothing(self):
+        """Test a query without a word of 3 characters returns nothing."""
+        self.create_player("p1@example.com", "Jan", "Kowalski")
+
+        self.assertEqual(self.search(q="ko"), [])
+        self.assertEqual(self.search(q="ja ko"), [])
+        self.assertEqual(self.search(), [])
+
+    def test_short_words_ignored(self):
+        """Test words shorter than 3 characters do not filter players."""
+        self.create_player("p1@example.com", "Jan", "Kowalski")
+        self.create_player("p2@example.com", "Jan", "Wiśniewski")
+
+        self.assertEqual(self.search(q="jan k"), ["Kowalski", "Wiśniewski"])
+
+    def test_limit(self):
+        """Test the number of results is limited and capped."""
+        for i in range(30):
+            self.create_player(f"p{i}@example.com", "Gracz", f"Gracz {i}")
+
+        self.assertEqual(len(self.search(q="gracz")), 10)
+        self.assertEqual(len(self.search(q="gracz", limit=3)), 3)
+        self.assertEqual(len(self.search(q="gracz", limit=100)), 25)
+
+    def test_invalid_limit(self):
+        """Test an invalid limit is rejected."""
+        for limit in ("abc", "0"):
+            res = self.client.get(
+                PLAYER_SEARCH_URL, {"q": "jan", "limit": limit}
+            )
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_only_partners_of_same_gender(self):
+        """Test the user and players of other gender are not returned."""
+        self.create_player("p1@example.com", "Ewa", "Nowacka", "FEMALE")
+        create_user(
+            email="org@example.com",
+            password="TestPass",
+            imie="Organizator",
+            nazwisko="Nowicki",
+            user_type="OR",
+            gender="MALE",
+        )
+
+        self.assertEqual(self.search(q="now"), [])
+
+    def test_auth_required(self):
+        """Test authentication is required to search players."""
+        self.client.force_authenticate(None)
+
+        res = self.client.get(PLAYER_SEARCH_URL, {"q": "nowak"})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
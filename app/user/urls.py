@@ -13,6 +13,8 @@ urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('me/', views.ManageUserView.as_view(), name='me'),
     path('players/', PlayerListView.as_view(), name='player-list'),
+    path('players/search/', views.PlayerSearchView.as_view(),
+         name='player-search'),
     path('login/', views.CustomLoginView.as_view(), name='custom-login'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
 ]
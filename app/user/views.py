@@ -3,9 +3,11 @@ Views for the user API.
 """
 
 from rest_framework import generics, authentication, permissions
+from rest_framework.exceptions import ParseError
 from rest_framework.views import APIView
 from django.views.generic import TemplateView
 from django.contrib.auth import authenticate, login
+from django.db.models import Case, Q, Value, When
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -22,6 +24,50 @@ from user.serializers import (
 
 logger = logging.getLogger(__name__)
 
+# Najkrótsze słowo frazy; indeks trigramowy wymaga co najmniej trzech
+# znaków, krótsze słowa wymuszałyby przeszukanie całej tabeli
+SEARCH_MIN_WORD_LENGTH = 3
+# Domyślna i maksymalna liczba podpowiedzi
+SEARCH_LIMIT = 10
+SEARCH_MAX_LIMIT = 25
+# Liczba słów frazy branych pod uwagę
+SEARCH_MAX_WORDS = 3
+
+
+def search_players(queryset, query):
+    """Filter players matching every word of a query, best matches first.
+
+    A word matches a substring of the first name, last name or e-mail.
+    Words starting a name rank first, then words starting the e-mail,
+    then other substring matches. Words shorter than
+    SEARCH_MIN_WORD_LENGTH are ignored, and a query without longer words
+    matches nobody.
+    """
+    words = [
+        word for word in query.split() if len(word) >= SEARCH_MIN_WORD_LENGTH
+    ]
+    if not words:
+        return queryset.none()
+
+    rank = Value(0)
+    for word in words[:SEARCH_MAX_WORDS]:
+        queryset = queryset.filter(
+            Q(imie__icontains=word)
+            | Q(nazwisko__icontains=word)
+            | Q(email__icontains=word)
+        )
+        rank += Case(
+            When(
+                Q(imie__istartswith=word) | Q(nazwisko__istartswith=word),
+                then=Value(0),
+            ),
+            When(email__istartswith=word, then=Value(1)),
+            default=Value(2),
+        )
+    return queryset.annotate(rank=rank).order_by(
+        "rank", "nazwisko", "imie", "id"
+    )
+
 
 class CreateUserView(generics.CreateAPIView):
     """Create a new user in the system."""
@@ -46,6 +92,32 @@ class PlayerListView(generics.ListAPIView):
         ).exclude(id=current_user.id)
 
 
+class PlayerSearchView(generics.ListAPIView):
+    """Typeahead search of players of the user's gender."""
+
+    serializer_class = UserListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        params = self.request.query_params
+        query = params.get("q", "").strip()
+        try:
+            limit = int(params.get("limit", SEARCH_LIMIT))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ParseError("Invalid limit parameter.")
+
+        current_user = self.request.user
+        players = (
+            User.objects.filter(user_type="PL", gender=current_user.gender)
+            .exclude(id=current_user.id)
+            .only("id", "imie", "nazwisko", "user_type")
+        )
+        limit = min(limit, SEARCH_MAX_LIMIT)
+        return search_players(players, query)[:limit]
+
+
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
 